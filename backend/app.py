@@ -29,7 +29,7 @@ from config import get_config
 
 # Import instrumentation modules
 try:
-    from backend.schema_dict import build_schema_dict, get_schema_dict
+    from backend.schema_dict import build_schema_dict, get_schema_dict, cached_validate_references
     from backend.kpi_verifier import verify_answer, extract_numeric_claims
     from backend.kpi_rollup import rollup_today
     from backend.metrics import filter_dataframe
@@ -439,7 +439,7 @@ def analyze_dataset(dataset):
                 # Check for hallucinations
                 schema_dict = get_schema_dict()
                 if schema_dict:
-                    hallucination_check = schema_dict.validate_references(answer_text, dataset)
+                    hallucination_check = cached_validate_references(answer_text, dataset)
                     g.request_metadata['extracted_metrics']['hallucination_check'] = hallucination_check
         
         return jsonify(result)
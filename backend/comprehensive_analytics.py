@@ -7,10 +7,52 @@ without requiring chart visualization.
 """
 
 import pandas as pd
+import numpy as np
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+# Optional: polars backend for the groupby-heavy aging/handoff insights
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+
+def _keyword_pattern(words: List[str]) -> re.Pattern:
+    """Compile a keyword list into a single alternation (substring match, like `word in text`)"""
+    return re.compile("|".join(re.escape(word) for word in words))
+
+
+# Query routing patterns, checked in order against the lower-cased query
+_INTENT_PATTERNS = [
+    ("aging", _keyword_pattern(["aging", "age", "old", "stale"])),
+    ("flow", _keyword_pattern(["flow", "efficiency", "touch", "wait"])),
+    ("handoffs", _keyword_pattern(["handoff", "handoffs", "transition", "transfer"])),
+    ("interactions", _keyword_pattern(["interaction", "clicks", "keys", "effort", "mouse", "keyboard"])),
+    ("summary", _keyword_pattern(["comprehensive", "complete", "all", "everything", "summary"])),
+]
+
+# Interaction-level vocabulary, matched against the query's word tokens
+_TEAM_WORDS = frozenset({"team", "teams"})
+_RESOURCE_WORDS = frozenset({"resource", "resources", "user", "users", "individual", "individuals", "person"})
+
+# Narrow dtypes for aggregate columns; insights only report one-decimal summaries.
+# Columns absent from a given file are ignored by read_csv.
+_AGGREGATE_DTYPES = {
+    "duration_seconds": "float32",
+    "duration_min": "float32",
+    "seconds": "float32",
+    "effort_per_min": "float32",
+    "mouse_clicks": "int32",
+    "keypresses": "int32",
+    "copies": "int32",
+    "pastes": "int32",
+}
+
 
 class ComprehensiveAnalyticsReader:
     """Reader for comprehensive analytics aggregate data"""
@@ -31,61 +73,131 @@ class ComprehensiveAnalyticsReader:
         
         # Check if aggregates directory exists
         self.has_comprehensive_data = self.aggregates_dir.exists()
+        
+        # Pre-joined per-dataset directories so lookups avoid Path construction
+        self._dataset_dirs = {
+            dataset: os.path.join(os.fspath(self.aggregates_dir), dataset)
+            for dataset in ("salesforce", "amadeus")
+        }
+    
+    def _aggregate_path(self, dataset: str, aggregate_name: str) -> Optional[str]:
+        """Return the aggregate CSV path if it exists, else None"""
+        if not self.has_comprehensive_data:
+            return None
+        
+        dataset_dir = self._dataset_dirs.get(dataset) or os.path.join(os.fspath(self.aggregates_dir), dataset)
+        file_path = os.path.join(dataset_dir, aggregate_name + ".csv")
+        return file_path if os.path.isfile(file_path) else None
     
-    def load_aggregate(self, dataset: str, aggregate_name: str) -> Optional[pd.DataFrame]:
+    def load_aggregate(self, dataset: str, aggregate_name: str,
+                       columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Load a specific aggregate CSV file
         
         Args:
             dataset: 'salesforce' or 'amadeus'
             aggregate_name: Name of the aggregate file (without .csv)
+            columns: Optional subset of columns to parse; columns missing
+                from the file are skipped rather than raising
         
         Returns:
             DataFrame or None if not found
         """
-        if not self.has_comprehensive_data:
+        file_path = self._aggregate_path(dataset, aggregate_name)
+        if file_path is None:
             return None
         
-        file_path = self.aggregates_dir / dataset / f"{aggregate_name}.csv"
+        usecols = (lambda col: col in columns) if columns is not None else None
         
         try:
-            if file_path.exists():
-                return pd.read_csv(file_path)
-            return None
+            try:
+                return pd.read_csv(file_path, usecols=usecols, dtype=_AGGREGATE_DTYPES)
+            except ValueError:
+                # e.g. missing values in an integer count column
+                return pd.read_csv(file_path, usecols=usecols)
         except Exception as e:
             print(f"Error loading {file_path}: {e}")
             return None
     
+    def _case_durations_polars(self, dataset: str, aggregate_name: str) -> Optional[np.ndarray]:
+        """Per-case total duration_min via polars, or None to fall back to pandas"""
+        file_path = self._aggregate_path(dataset, aggregate_name)
+        if file_path is None:
+            return None
+        
+        try:
+            per_case = (
+                pl.scan_csv(file_path)
+                .filter(pl.col('Case_ID').is_not_null())
+                .group_by('Case_ID')
+                .agg(pl.col('duration_min').cast(pl.Float64).sum())
+                .collect()
+            )
+        except Exception as e:
+            print(f"Polars aggregation failed for {file_path}, using pandas: {e}")
+            return None
+        
+        return per_case['duration_min'].to_numpy() if per_case.height else None
+    
+    def _team_handoffs_polars(self, dataset: str, aggregate_name: str) -> Optional[np.ndarray]:
+        """Per-case team handoff counts via polars, or None to fall back to pandas"""
+        file_path = self._aggregate_path(dataset, aggregate_name)
+        if file_path is None:
+            return None
+        
+        try:
+            per_case = (
+                pl.scan_csv(file_path)
+                .select(['Case_ID', 'Start_Time', 'team'])
+                .drop_nulls(['Case_ID', 'team'])
+                .sort(['Case_ID', 'Start_Time'], maintain_order=True)
+                .group_by('Case_ID', maintain_order=True)
+                .agg((pl.col('team') != pl.col('team').shift()).sum().alias('handoffs'))
+                .collect()
+            )
+        except Exception as e:
+            print(f"Polars aggregation failed for {file_path}, using pandas: {e}")
+            return None
+        
+        return per_case['handoffs'].to_numpy() if per_case.height else None
+    
     def get_case_aging_insights(self, dataset: str = "salesforce") -> str:
         """Get insights about case aging distribution"""
         prefix = "sf" if dataset == "salesforce" else "ama"
         
-        # Try to load from case stage stack data
-        stage_df = self.load_aggregate(dataset, f"{prefix}_case_stage_stack")
+        case_durations = None
+        if POLARS_AVAILABLE:
+            case_durations = self._case_durations_polars(dataset, f"{prefix}_case_stage_stack")
         
-        if stage_df is None or stage_df.empty:
-            return f"Case aging data not available for {dataset}."
-        
-        # Calculate aging buckets
-        case_durations = stage_df.groupby('Case_ID')['duration_min'].sum()
+        if case_durations is None:
+            # Try to load from case stage stack data
+            stage_df = self.load_aggregate(dataset, f"{prefix}_case_stage_stack", columns=['Case_ID', 'duration_min'])
+            
+            if stage_df is None or stage_df.empty:
+                return f"Case aging data not available for {dataset}."
+            
+            # Accumulate in float64 since duration_min is stored as float32
+            case_durations = (
+                stage_df['duration_min'].astype('float64')
+                .groupby(stage_df['Case_ID']).sum().to_numpy()
+            )
         
         total_cases = len(case_durations)
-        aging_0_1d = (case_durations <= 1440).sum()  # 24 hours
-        aging_1_3d = ((case_durations > 1440) & (case_durations <= 4320)).sum()
-        aging_3_7d = ((case_durations > 4320) & (case_durations <= 10080)).sum()
-        aging_7_14d = ((case_durations > 10080) & (case_durations <= 20160)).sum()
-        aging_14d_plus = (case_durations > 20160).sum()
+        # Bucket upper bounds (minutes): 1, 3, 7, 14 days; the last bucket is >14 days
+        bucket_idx = np.searchsorted([1440, 4320, 10080, 20160], case_durations, side='left')
+        counts = np.bincount(bucket_idx, minlength=5)
+        pct = counts / total_cases * 100
         
         insights = f"""
 Case Aging Analysis for {dataset.title()}:
 • Total cases analyzed: {total_cases}
-• Cases aged 0-1 days: {aging_0_1d} ({aging_0_1d/total_cases*100:.1f}%)
-• Cases aged 1-3 days: {aging_1_3d} ({aging_1_3d/total_cases*100:.1f}%)
-• Cases aged 3-7 days: {aging_3_7d} ({aging_3_7d/total_cases*100:.1f}%)
-• Cases aged 7-14 days: {aging_7_14d} ({aging_7_14d/total_cases*100:.1f}%)
-• Cases aged >14 days: {aging_14d_plus} ({aging_14d_plus/total_cases*100:.1f}%)
+• Cases aged 0-1 days: {counts[0]} ({pct[0]:.1f}%)
+• Cases aged 1-3 days: {counts[1]} ({pct[1]:.1f}%)
+• Cases aged 3-7 days: {counts[2]} ({pct[2]:.1f}%)
+• Cases aged 7-14 days: {counts[3]} ({pct[3]:.1f}%)
+• Cases aged >14 days: {counts[4]} ({pct[4]:.1f}%)
 
-Key Insight: {aging_14d_plus} cases ({aging_14d_plus/total_cases*100:.1f}%) are over 14 days old, which may indicate bottlenecks or stalled processes.
+Key Insight: {counts[4]} cases ({pct[4]:.1f}%) are over 14 days old, which may indicate bottlenecks or stalled processes.
 """
         
         return insights.strip()
@@ -94,15 +206,19 @@ Key Insight: {aging_14d_plus} cases ({aging_14d_plus/total_cases*100:.1f}%) are
         """Get insights about flow efficiency (touch vs wait time)"""
         prefix = "sf" if dataset == "salesforce" else "ama"
         
-        waterfall_df = self.load_aggregate(dataset, f"{prefix}_case_wait_touch_waterfall")
+        waterfall_df = self.load_aggregate(dataset, f"{prefix}_case_wait_touch_waterfall", columns=['segment', 'seconds'])
         
         if waterfall_df is None or waterfall_df.empty:
             return f"Flow efficiency data not available for {dataset}."
         
         # Aggregate touch and wait times
         if 'segment' in waterfall_df.columns and 'seconds' in waterfall_df.columns:
-            touch_time = waterfall_df[waterfall_df['segment'].str.contains('touch', case=False, na=False)]['seconds'].sum()
-            wait_time = waterfall_df[waterfall_df['segment'].str.contains('wait', case=False, na=False)]['seconds'].sum()
+            # Accumulate in float64 since seconds are stored as float32
+            seconds = waterfall_df['seconds'].to_numpy()
+            touch_mask = waterfall_df['segment'].str.contains('touch', case=False, na=False).to_numpy()
+            wait_mask = waterfall_df['segment'].str.contains('wait', case=False, na=False).to_numpy()
+            touch_time = np.nansum(seconds[touch_mask], dtype=np.float64)
+            wait_time = np.nansum(seconds[wait_mask], dtype=np.float64)
             
             total_time = touch_time + wait_time
             flow_efficiency = (touch_time / total_time * 100) if total_time > 0 else 0
@@ -127,34 +243,47 @@ Interpretation:
     def get_handoff_insights(self, dataset: str = "salesforce", by: str = "team") -> str:
         """Get insights about handoffs between teams or resources"""
         if dataset == "salesforce" and by == "team":
-            # Load team handoff data
-            timeline_df = self.load_aggregate(dataset, "sf_case_timeline_gantt")
-            
-            if timeline_df is None or timeline_df.empty or 'team' not in timeline_df.columns:
-                return f"Team handoff data not available for {dataset}."
+            handoffs_per_case = None
+            if POLARS_AVAILABLE:
+                handoffs_per_case = self._team_handoffs_polars(dataset, "sf_case_timeline_gantt")
             
-            # Calculate handoffs per case
-            handoffs_per_case = []
-            for case_id in timeline_df['Case_ID'].unique():
-                case_data = timeline_df[timeline_df['Case_ID'] == case_id].sort_values('Start_Time')
-                teams = case_data['team'].tolist()
+            if handoffs_per_case is None:
+                # Load team handoff data
+                timeline_df = self.load_aggregate(dataset, "sf_case_timeline_gantt", columns=['Case_ID', 'Start_Time', 'team'])
+                
+                if timeline_df is None or 'team' not in timeline_df.columns:
+                    return f"Team handoff data not available for {dataset}."
                 
-                handoff_count = 0
-                for i in range(1, len(teams)):
-                    if teams[i] != teams[i-1]:
-                        handoff_count += 1
+                # Rows without a case or team would factorize to -1, which would
+                # index np.bincount negatively or look like a team change
+                timeline_df = timeline_df.dropna(subset=['Case_ID', 'team'])
+                if timeline_df.empty:
+                    return f"Team handoff data not available for {dataset}."
                 
-                handoffs_per_case.append(handoff_count)
+                # Calculate handoffs per case: sort once, then compare neighbouring
+                # rows on factorized codes instead of slicing the frame per case
+                sorted_df = timeline_df.sort_values(['Case_ID', 'Start_Time'], kind='mergesort')
+                case_codes, case_ids = pd.factorize(sorted_df['Case_ID'])
+                team_codes = pd.factorize(sorted_df['team'])[0]
+                
+                same_case = case_codes[1:] == case_codes[:-1]
+                team_changed = team_codes[1:] != team_codes[:-1]
+                handoffs_per_case = np.bincount(
+                    case_codes[1:][same_case & team_changed], minlength=len(case_ids)
+                )
             
-            avg_handoffs = sum(handoffs_per_case) / len(handoffs_per_case) if handoffs_per_case else 0
-            max_handoffs = max(handoffs_per_case) if handoffs_per_case else 0
+            n_cases = len(handoffs_per_case)
+            avg_handoffs = handoffs_per_case.mean() if n_cases else 0
+            max_handoffs = handoffs_per_case.max() if n_cases else 0
+            zero_handoffs = int((handoffs_per_case == 0).sum())
+            many_handoffs = int((handoffs_per_case >= 3).sum())
             
             insights = f"""
 Team Handoff Analysis for {dataset.title()}:
 • Average handoffs per case: {avg_handoffs:.1f}
 • Maximum handoffs in a single case: {max_handoffs}
-• Cases with 0 handoffs: {handoffs_per_case.count(0)} ({handoffs_per_case.count(0)/len(handoffs_per_case)*100:.1f}%)
-• Cases with 3+ handoffs: {sum(1 for h in handoffs_per_case if h >= 3)} ({sum(1 for h in handoffs_per_case if h >= 3)/len(handoffs_per_case)*100:.1f}%)
+• Cases with 0 handoffs: {zero_handoffs} ({zero_handoffs/n_cases*100:.1f}%)
+• Cases with 3+ handoffs: {many_handoffs} ({many_handoffs/n_cases*100:.1f}%)
 
 Key Insight: Each handoff adds coordination overhead and potential delays. Cases with multiple handoffs may benefit from process redesign or better team coordination.
 """
@@ -169,8 +298,11 @@ Key Insight: Each handoff adds coordination overhead and potential delays. Cases
         
         if level == "team" and dataset == "salesforce":
             # Load team-level interaction data
-            input_mix_df = self.load_aggregate(dataset, f"{prefix}_input_mix_by_team")
-            effort_rate_df = self.load_aggregate(dataset, f"{prefix}_effort_rate_by_team")
+            input_mix_df = self.load_aggregate(
+                dataset, f"{prefix}_input_mix_by_team",
+                columns=['mouse_clicks', 'keypresses', 'copies', 'pastes']
+            )
+            effort_rate_df = self.load_aggregate(dataset, f"{prefix}_effort_rate_by_team", columns=['effort_per_min'])
             
             if input_mix_df is None or effort_rate_df is None:
                 return f"Team interaction data not available for {dataset}."
@@ -185,6 +317,10 @@ Key Insight: Each handoff adds coordination overhead and potential delays. Cases
             
             avg_effort_rate = effort_rate_df['effort_per_min'].mean() if 'effort_per_min' in effort_rate_df.columns else 0
             
+            clicks_pct, keys_pct, copy_paste_pct = (
+                np.array([total_clicks, total_keys, total_copies + total_pastes]) / total_interactions * 100
+            )
+            
             insights = f"""
 Interaction Analysis for {dataset.title()} Teams:
 • Total mouse clicks: {total_clicks:,}
@@ -194,19 +330,21 @@ Interaction Analysis for {dataset.title()} Teams:
 • Average effort rate: {avg_effort_rate:.1f} interactions/minute
 
 Input Mix:
-• Clicks: {total_clicks/total_interactions*100:.1f}%
-• Keypresses: {total_keys/total_interactions*100:.1f}%
-• Copy/Paste: {(total_copies+total_pastes)/total_interactions*100:.1f}%
+• Clicks: {clicks_pct:.1f}%
+• Keypresses: {keys_pct:.1f}%
+• Copy/Paste: {copy_paste_pct:.1f}%
 
-Key Insight: High copy/paste rates ({(total_copies+total_pastes)/total_interactions*100:.1f}%) may indicate manual data entry that could be automated.
+Key Insight: High copy/paste rates ({copy_paste_pct:.1f}%) may indicate manual data entry that could be automated.
 """
             
             return insights.strip()
         
         elif level == "resource":
             # Load resource-level interaction data
-            leaderboard_df = self.load_aggregate(dataset, f"{prefix}_resource_effort_leaderboard")
-            effort_rate_df = self.load_aggregate(dataset, f"{prefix}_resource_effort_rate")
+            leaderboard_df = self.load_aggregate(
+                dataset, f"{prefix}_resource_effort_leaderboard", columns=['Resource', 'total_interactions']
+            )
+            effort_rate_df = self.load_aggregate(dataset, f"{prefix}_resource_effort_rate", columns=['effort_per_min'])
             
             if leaderboard_df is None or effort_rate_df is None:
                 return f"Resource interaction data not available for {dataset}."
@@ -217,51 +355,51 @@ Key Insight: High copy/paste rates ({(total_copies+total_pastes)/total_interacti
             avg_effort = effort_rate_df['effort_per_min'].mean() if 'effort_per_min' in effort_rate_df.columns else 0
             max_effort = effort_rate_df['effort_per_min'].max() if 'effort_per_min' in effort_rate_df.columns else 0
             
-            insights = f"""
+            lines = [f"""
 Resource Interaction Analysis for {dataset.title()}:
 • Average effort rate: {avg_effort:.1f} interactions/minute
 • Maximum effort rate: {max_effort:.1f} interactions/minute
 • Performance spread: {max_effort - avg_effort:.1f} interactions/minute
 
-Top 5 Most Active Resources:
-"""
-            
+Top 5 Most Active Resources:"""]
+
             for idx, row in top_5_resources.iterrows():
                 resource = row.get('Resource', 'Unknown')
                 interactions = row.get('total_interactions', 0)
-                insights += f"• {resource}: {interactions:,} interactions\n"
-            
-            insights += f"\nKey Insight: Performance variation suggests opportunities for training or process standardization."
-            
-            return insights.strip()
+                lines.append(f"• {resource}: {interactions:,} interactions")
+
+            lines.append("")
+            lines.append("Key Insight: Performance variation suggests opportunities for training or process standardization.")
+
+            return "\n".join(lines).strip()
         
         return f"Interaction analysis not available for {dataset} at {level} level."
     
     def get_comprehensive_summary(self, dataset: str = "salesforce") -> str:
         """Get a comprehensive summary combining multiple analytics"""
-        insights = []
-        
-        insights.append(f"=== Comprehensive Analytics Summary for {dataset.title()} ===\n")
+        # Each section reads its own aggregate files, so they can run concurrently
+        sections = [
+            ("1. CASE AGING:", self.get_case_aging_insights, (dataset,)),
+            ("2. FLOW EFFICIENCY:", self.get_flow_efficiency_insights, (dataset,)),
+        ]
+        if dataset == "salesforce":
+            sections.append(("3. TEAM HANDOFFS:", self.get_handoff_insights, (dataset, "team")))
+        sections.append(("4. USER INTERACTIONS:", self.get_interaction_insights, (dataset, "team")))
         
-        # Case aging
-        insights.append("1. CASE AGING:")
-        insights.append(self.get_case_aging_insights(dataset))
-        insights.append("")
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = [executor.submit(fn, *args) for _, fn, args in sections]
+            results = [future.result() for future in futures]
         
-        # Flow efficiency
-        insights.append("2. FLOW EFFICIENCY:")
-        insights.append(self.get_flow_efficiency_insights(dataset))
-        insights.append("")
+        insights = []
+        insights.append(f"=== Comprehensive Analytics Summary for {dataset.title()} ===\n")
         
-        # Handoffs
-        if dataset == "salesforce":
-            insights.append("3. TEAM HANDOFFS:")
-            insights.append(self.get_handoff_insights(dataset, "team"))
+        for (title, _, _), result in zip(sections, results):
+            insights.append(title)
+            insights.append(result)
             insights.append("")
         
-        # Interactions
-        insights.append("4. USER INTERACTIONS:")
-        insights.append(self.get_interaction_insights(dataset, "team"))
+        # No trailing blank line after the last section
+        insights.pop()
         
         return "\n".join(insights)
     
@@ -279,24 +417,23 @@ Top 5 Most Active Resources:
         query_lower = query.lower()
         
         # Route to appropriate analysis based on query
-        if any(word in query_lower for word in ["aging", "age", "old", "stale"]):
+        intent = next((name for name, pattern in _INTENT_PATTERNS if pattern.search(query_lower)), None)
+        
+        if intent == "aging":
             return self.get_case_aging_insights(dataset)
         
-        elif any(word in query_lower for word in ["flow", "efficiency", "touch", "wait"]):
+        elif intent == "flow":
             return self.get_flow_efficiency_insights(dataset)
         
-        elif any(word in query_lower for word in ["handoff", "handoffs", "transition", "transfer"]):
+        elif intent == "handoffs":
             return self.get_handoff_insights(dataset)
         
-        elif any(word in query_lower for word in ["interaction", "clicks", "keys", "effort", "mouse", "keyboard"]):
-            if any(word in query_lower for word in ["team", "teams"]):
-                return self.get_interaction_insights(dataset, "team")
-            elif any(word in query_lower for word in ["resource", "user", "individual", "person"]):
-                return self.get_interaction_insights(dataset, "resource")
-            else:
-                return self.get_interaction_insights(dataset, "team")
+        elif intent == "interactions":
+            tokens = set(re.findall(r"\w+", query_lower))
+            level = "team" if tokens & _TEAM_WORDS else "resource" if tokens & _RESOURCE_WORDS else "team"
+            return self.get_interaction_insights(dataset, level)
         
-        elif any(word in query_lower for word in ["comprehensive", "complete", "all", "everything", "summary"]):
+        elif intent == "summary":
             return self.get_comprehensive_summary(dataset)
         
         else:
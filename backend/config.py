@@ -3,100 +3,133 @@ Configuration management for Task Mining Multi-Agent System
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-class Config:
-    """Base configuration class"""
-    
+def _env_bool(value: str) -> bool:
+    return value.lower() == 'true'
+
+
+def _env_list(value: str) -> list:
+    return value.split(',')
+
+
+# Environment-backed settings: name -> (parser, default).
+# Values are parsed on first access rather than at import time.
+_ENV_SETTINGS = {
     # Data Sources Configuration
     # Use relative path from the config file location
-    _config_dir = Path(__file__).parent.parent
-    DATA_BASE_DIR = os.getenv(
-        'DATA_BASE_DIR', 
-        str(_config_dir / "Data Sources")
-    )
-    
-    SALESFORCE_CSV_FILE = os.getenv('SALESFORCE_CSV_FILE', 'SalesforceOffice_synthetic_varied_100users_V1_with_teams.csv')
-    AMADEUS_CSV_FILE = os.getenv('AMADEUS_CSV_FILE', 'amadeus-demo-full-no-fields.csv')
-    CHARTS_OUTPUT_DIR = os.getenv('CHARTS_OUTPUT_DIR', 'charts')
+    'DATA_BASE_DIR': (str, str(Path(__file__).parent.parent / "Data Sources")),
+    'SALESFORCE_CSV_FILE': (str, 'SalesforceOffice_synthetic_varied_100users_V1_with_teams.csv'),
+    'AMADEUS_CSV_FILE': (str, 'amadeus-demo-full-no-fields.csv'),
+    'CHARTS_OUTPUT_DIR': (str, 'charts'),
     
     # Flask Configuration
-    SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
-    FLASK_ENV = os.getenv('FLASK_ENV', 'development')
-    FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-    FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
-    FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
+    'SECRET_KEY': (str, 'dev-secret-key-change-in-production'),
+    'FLASK_ENV': (str, 'development'),
+    'FLASK_DEBUG': (_env_bool, 'True'),
+    'FLASK_HOST': (str, '0.0.0.0'),
+    'FLASK_PORT': (int, 5000),
     
     # API Configuration
-    API_TIMEOUT = int(os.getenv('API_TIMEOUT', 30))
-    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16777216))  # 16MB
+    'API_TIMEOUT': (int, 30),
+    'MAX_CONTENT_LENGTH': (int, 16777216),  # 16MB
     
     # CORS Configuration
-    CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000,http://127.0.0.1:3000').split(',')
+    'CORS_ORIGINS': (_env_list, 'http://localhost:3000,http://127.0.0.1:3000'),
     
     # Chart & Visualization Configuration
-    CHART_WIDTH = int(os.getenv('CHART_WIDTH', 800))
-    CHART_HEIGHT = int(os.getenv('CHART_HEIGHT', 500))
-    CHART_DPI = int(os.getenv('CHART_DPI', 300))
+    'CHART_WIDTH': (int, 800),
+    'CHART_HEIGHT': (int, 500),
+    'CHART_DPI': (int, 300),
     
     # PDF Export Configuration
-    PDF_PAGE_SIZE = os.getenv('PDF_PAGE_SIZE', 'A4')
-    PDF_MARGIN = int(os.getenv('PDF_MARGIN', 72))  # 1 inch in points
-    PDF_TITLE_FONT_SIZE = int(os.getenv('PDF_TITLE_FONT_SIZE', 18))
-    PDF_HEADING_FONT_SIZE = int(os.getenv('PDF_HEADING_FONT_SIZE', 14))
-    PDF_BODY_FONT_SIZE = int(os.getenv('PDF_BODY_FONT_SIZE', 12))
+    'PDF_PAGE_SIZE': (str, 'A4'),
+    'PDF_MARGIN': (int, 72),  # 1 inch in points
+    'PDF_TITLE_FONT_SIZE': (int, 18),
+    'PDF_HEADING_FONT_SIZE': (int, 14),
+    'PDF_BODY_FONT_SIZE': (int, 12),
     
     # Matplotlib Configuration
-    MATPLOTLIB_BACKEND = os.getenv('MATPLOTLIB_BACKEND', 'Agg')
+    'MATPLOTLIB_BACKEND': (str, 'Agg'),
     
     # Analysis Configuration
-    DEFAULT_CHART_LIMIT = int(os.getenv('DEFAULT_CHART_LIMIT', 20))
-    BOTTLENECK_THRESHOLD_PERCENTILE = int(os.getenv('BOTTLENECK_THRESHOLD_PERCENTILE', 80))
-    MIN_TASKS_FOR_EFFICIENCY_ANALYSIS = int(os.getenv('MIN_TASKS_FOR_EFFICIENCY_ANALYSIS', 5))
+    'DEFAULT_CHART_LIMIT': (int, 20),
+    'BOTTLENECK_THRESHOLD_PERCENTILE': (int, 80),
+    'MIN_TASKS_FOR_EFFICIENCY_ANALYSIS': (int, 5),
     
     # Time Analysis Configuration
-    TIME_ANALYSIS_HOURS = os.getenv('TIME_ANALYSIS_HOURS', 'True').lower() == 'true'
-    TIME_ANALYSIS_DAYS = os.getenv('TIME_ANALYSIS_DAYS', 'True').lower() == 'true'
-    PEAK_HOURS_THRESHOLD = float(os.getenv('PEAK_HOURS_THRESHOLD', 2.0))
+    'TIME_ANALYSIS_HOURS': (_env_bool, 'True'),
+    'TIME_ANALYSIS_DAYS': (_env_bool, 'True'),
+    'PEAK_HOURS_THRESHOLD': (float, 2.0),
     
     # Logging Configuration
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE = os.getenv('LOG_FILE', 'logs/task_mining.log')
-    ERROR_LOG_FILE = os.getenv('ERROR_LOG_FILE', 'logs/error.log')
-    CONSOLE_LOGGING = os.getenv('CONSOLE_LOGGING', 'True').lower() == 'true'
-    LOG_DIR = os.getenv('LOG_DIR', './logs')
+    'LOG_LEVEL': (str, 'INFO'),
+    'LOG_FILE': (str, 'logs/task_mining.log'),
+    'ERROR_LOG_FILE': (str, 'logs/error.log'),
+    'CONSOLE_LOGGING': (_env_bool, 'True'),
+    'LOG_DIR': (str, './logs'),
     
     # KPI Instrumentation Configuration
-    ENABLE_TRACING = os.getenv('ENABLE_TRACING', 'True').lower() == 'true'
-    TOLERANCE_PCT = float(os.getenv('TOLERANCE_PCT', '0.02'))  # 2% tolerance for metric verification
+    'ENABLE_TRACING': (_env_bool, 'True'),
+    'TOLERANCE_PCT': (float, '0.02'),  # 2% tolerance for metric verification
     
     # Security & Performance
-    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'False').lower() == 'true'
-    RATE_LIMIT_REQUESTS_PER_MINUTE = int(os.getenv('RATE_LIMIT_REQUESTS_PER_MINUTE', 60))
+    'RATE_LIMIT_ENABLED': (_env_bool, 'False'),
+    'RATE_LIMIT_REQUESTS_PER_MINUTE': (int, 60),
     
-    CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'False').lower() == 'true'
-    CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 300))
+    'CACHE_ENABLED': (_env_bool, 'False'),
+    'CACHE_DEFAULT_TIMEOUT': (int, 300),
     
     # Development & Testing
-    USE_TEST_DATA = os.getenv('USE_TEST_DATA', 'False').lower() == 'true'
-    TEST_DATA_SIZE = int(os.getenv('TEST_DATA_SIZE', 1000))
+    'USE_TEST_DATA': (_env_bool, 'False'),
+    'TEST_DATA_SIZE': (int, 1000),
     
-    ENABLE_DEBUG_TOOLBAR = os.getenv('ENABLE_DEBUG_TOOLBAR', 'False').lower() == 'true'
-    ENABLE_PROFILER = os.getenv('ENABLE_PROFILER', 'False').lower() == 'true'
+    'ENABLE_DEBUG_TOOLBAR': (_env_bool, 'False'),
+    'ENABLE_PROFILER': (_env_bool, 'False'),
     
-    MOCK_EXTERNAL_SERVICES = os.getenv('MOCK_EXTERNAL_SERVICES', 'True').lower() == 'true'
+    'MOCK_EXTERNAL_SERVICES': (_env_bool, 'True'),
     
     # Export & Reporting
-    DEFAULT_EXPORT_FORMAT = os.getenv('DEFAULT_EXPORT_FORMAT', 'pdf')
-    INCLUDE_CHART_DATA_IN_PDF = os.getenv('INCLUDE_CHART_DATA_IN_PDF', 'True').lower() == 'true'
-    PDF_COMPRESSION = os.getenv('PDF_COMPRESSION', 'True').lower() == 'true'
+    'DEFAULT_EXPORT_FORMAT': (str, 'pdf'),
+    'INCLUDE_CHART_DATA_IN_PDF': (_env_bool, 'True'),
+    'PDF_COMPRESSION': (_env_bool, 'True'),
+    
+    'EXPORT_FILE_PREFIX': (str, 'task_mining_analysis'),
+    'EXPORT_TIMESTAMP_FORMAT': (str, '%Y%m%d_%H%M%S'),
+}
+
+
+@lru_cache(maxsize=None)
+def _env_setting(name: str):
+    """Parse an environment-backed setting once and cache the result"""
+    parser, default = _ENV_SETTINGS[name]
+    return parser(os.getenv(name, default))
+
+
+class _LazyEnvConfig(type):
+    """Metaclass resolving unset class attributes from _ENV_SETTINGS on demand"""
+    
+    def __getattr__(cls, name):
+        if name in _ENV_SETTINGS:
+            return _env_setting(name)
+        raise AttributeError(f"type object '{cls.__name__}' has no attribute '{name}'")
+    
+    def __dir__(cls):
+        # Flask's app.config.from_object() discovers settings via dir()
+        return sorted(set(super().__dir__()) | set(_ENV_SETTINGS))
+
+
+class Config(metaclass=_LazyEnvConfig):
+    """Base configuration class"""
     
-    EXPORT_FILE_PREFIX = os.getenv('EXPORT_FILE_PREFIX', 'task_mining_analysis')
-    EXPORT_TIMESTAMP_FORMAT = os.getenv('EXPORT_TIMESTAMP_FORMAT', '%Y%m%d_%H%M%S')
+    def __getattr__(self, name):
+        # Instance lookups don't consult the metaclass, so defer to the class
+        return getattr(type(self), name)
     
     # Computed properties
     @property
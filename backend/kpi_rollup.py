@@ -12,79 +12,460 @@ Reads JSONL trace files and computes aggregated KPIs including:
 - Adoption metrics
 """
 
+import os
+from array import array
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import json
 from datetime import datetime, date, timedelta
 import numpy as np
+import pandas as pd
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 
+# Optional: orjson parses trace lines several times faster than stdlib json
+try:
+    from orjson import loads as _json_loads
+    ORJSON_AVAILABLE = True
+except ImportError:
+    from json import loads as _json_loads
+    ORJSON_AVAILABLE = False
 
-def read_traces(trace_file: Path) -> List[Dict[str, Any]]:
+
+def iter_traces(trace_file: Path) -> Iterator[Dict[str, Any]]:
     """
-    Read JSONL trace file
+    Stream JSONL trace file one record at a time
     
     Args:
         trace_file: Path to JSONL trace file
     
-    Returns:
-        List of trace records
+    Yields:
+        Trace records, skipping malformed lines
     """
-    traces = []
-    
     if not trace_file.exists():
-        return traces
+        return
     
     try:
-        with open(trace_file, 'r', encoding='utf-8') as f:
+        # Read raw bytes; both parsers accept UTF-8 bytes and ignore the trailing newline
+        with open(trace_file, 'rb') as f:
             for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        trace = json.loads(line)
-                        traces.append(trace)
-                    except json.JSONDecodeError:
-                        pass  # Skip malformed lines
+                if line.isspace():
+                    continue
+                try:
+                    trace = _json_loads(line)
+                except ValueError:
+                    continue  # Skip malformed lines
+                yield trace
     except Exception as e:
         print(f"Error reading trace file {trace_file}: {e}")
+
+
+def read_traces(trace_file: Path) -> List[Dict[str, Any]]:
+    """
+    Read JSONL trace file
+    
+    Args:
+        trace_file: Path to JSONL trace file
+    
+    Returns:
+        List of trace records
+    """
+    return list(iter_traces(trace_file))
+
+
+# Default panel metrics for MAPE matching
+DEFAULT_PANEL_METRICS = [
+    "flow_efficiency", "handoffs", "throughput_minutes",
+    "aging_>14d", "case_count"
+]
+
+# Endpoints whose traces count as generated answers for hallucination rate
+ANSWER_ENDPOINTS = ("/api/analyze", "/api/agent")
+
+# Relative change between successive claims of a metric counted as a contradiction
+CONTRADICTION_TOLERANCE = 0.10
+
+# Sentinel for traces without a session_id key
+_MISSING = object()
+
+
+def _p50_p95(values: np.ndarray) -> Tuple[float, float]:
+    """
+    p50 and p95 of a non-empty array, matching np.percentile's linear interpolation
+    
+    Both quantiles come from a single np.partition call instead of one
+    selection pass per np.percentile call.
+    
+    Args:
+        values: 1-D float array (partitioned in place)
+    
+    Returns:
+        Tuple of (p50, p95)
+    """
+    last = len(values) - 1
+    pos50 = 0.5 * last
+    pos95 = 0.95 * last
+    lo50, lo95 = int(pos50), int(pos95)
+    hi50, hi95 = min(lo50 + 1, last), min(lo95 + 1, last)
+    
+    values.partition(sorted({lo50, hi50, lo95, hi95}))
+    
+    p50 = values[lo50] + (values[hi50] - values[lo50]) * (pos50 - lo50)
+    p95 = values[lo95] + (values[hi95] - values[lo95]) * (pos95 - lo95)
+    return p50, p95
+
+
+@lru_cache(maxsize=256)
+def _normalize_metric_name(name: str) -> str:
+    """Lowercase a metric name and drop underscores/spaces for fuzzy matching"""
+    return name.lower().replace("_", "").replace(" ", "")
+
+
+def _latency_summary(latencies_total, latencies_model) -> Dict[str, float]:
+    """p50/p95/mean of total and model latency samples (empty series are omitted)"""
+    results = {}
+    
+    if latencies_total:
+        arr = np.array(latencies_total, dtype=np.float64)
+        results["p50_total"], results["p95_total"] = _p50_p95(arr)
+        results["mean_total"] = arr.mean()
+    
+    if latencies_model:
+        arr = np.array(latencies_model, dtype=np.float64)
+        results["p50_model"], results["p95_model"] = _p50_p95(arr)
+        results["mean_model"] = arr.mean()
+    
+    return results
+
+
+class _RollupAccumulator:
+    """
+    Running state for every daily KPI, filled in a single pass over the traces
+    
+    Each trace is visited once and its fields are read once; the KPI values
+    are derived from the accumulated state by the finalizer methods.
+    """
+    
+    __slots__ = (
+        "panel_metrics", "panel_normalized", "panel_lookup", "trace_count",
+        "claim_pass", "claim_total",
+        "route_pass", "route_total",
+        "hallucinated_answers", "total_answers",
+        "metric_err_sum", "metric_err_count", "overall_err_sum", "overall_err_count",
+        "latency_total", "latency_model", "endpoint_latencies",
+        "claim_sessions",
+        "unique_users", "adoption_sessions",
+        "resolution_by_session",
+    )
+    
+    def __init__(self, panel_metrics: List[str] = None):
+        self.panel_metrics = panel_metrics if panel_metrics is not None else DEFAULT_PANEL_METRICS
+        
+        # Panel metric normalizations, computed once, and a memo of
+        # normalized claim name -> matched panel metric (or None)
+        self.panel_normalized = [
+            (panel_metric, _normalize_metric_name(panel_metric))
+            for panel_metric in self.panel_metrics
+        ]
+        self.panel_lookup = {}
+        self.trace_count = 0
+        
+        # Grounded accuracy / routing accuracy / hallucination counters
+        self.claim_pass = 0
+        self.claim_total = 0
+        self.route_pass = 0
+        self.route_total = 0
+        self.hallucinated_answers = 0
+        self.total_answers = 0
+        
+        # Metric parity: running pct error sum and count per panel metric
+        self.metric_err_sum = defaultdict(float)
+        self.metric_err_count = defaultdict(int)
+        self.overall_err_sum = 0.0
+        self.overall_err_count = 0
+        
+        # Latency: overall and per-endpoint (total, model) samples, stored as
+        # packed doubles (8 bytes each) rather than lists of float objects
+        self.latency_total = array('d')
+        self.latency_model = array('d')
+        self.endpoint_latencies = {}
+        
+        # Contradictions: (timestamp, claims) tuples per session; the trace
+        # dict itself is not retained
+        self.claim_sessions = defaultdict(list)
+        
+        # Adoption
+        self.unique_users = set()
+        self.adoption_sessions = set()
+        
+        # Resolution: session -> [turns seen, turn of first resolution]
+        self.resolution_by_session = {}
+    
+    def add(self, trace: Dict[str, Any]):
+        """Fold one trace record into every KPI accumulator"""
+        self.trace_count += 1
+        
+        endpoint = trace.get("endpoint")
+        extracted_metrics = trace.get("extracted_metrics")
+        session_id = trace.get("session_id", _MISSING)
+        
+        # Hallucination rate denominator (only traces that generated answers)
+        is_answer = endpoint in ANSWER_ENDPOINTS
+        if is_answer:
+            self.total_answers += 1
+        
+        # All claim-derived KPIs (grounded accuracy, metric parity, contradictions,
+        # hallucinations) need extracted metrics; most traces skip this branch
+        if extracted_metrics:
+            if extracted_metrics.get("has_numeric_claims"):
+                grounded_pass = extracted_metrics.get("grounded_accuracy_pass")
+                if grounded_pass is not None:
+                    self.claim_total += 1
+                    if grounded_pass:
+                        self.claim_pass += 1
+                
+                self.claim_sessions["default" if session_id is _MISSING else session_id].append(
+                    (trace.get("timestamp_utc", ""), extracted_metrics.get("all_claims", []))
+                )
+            
+            for result in extracted_metrics.get("verification_results", []):
+                metric_name = result.get("name")
+                pct_err = result.get("pct_err")
+                
+                if metric_name and pct_err is not None:
+                    # Normalize metric name
+                    normalized_name = _normalize_metric_name(metric_name)
+                    
+                    # Match to panel metrics
+                    panel_metric = self.match_panel_metric(normalized_name)
+                    if panel_metric is not None:
+                        self.metric_err_sum[panel_metric] += pct_err
+                        self.metric_err_count[panel_metric] += 1
+                        self.overall_err_sum += pct_err
+                        self.overall_err_count += 1
+            
+            if is_answer and extracted_metrics.get("hallucination_check", {}).get("has_hallucinations"):
+                self.hallucinated_answers += 1
+        
+        # Routing accuracy
+        router_correct = trace.get("router_correct")
+        if router_correct is not None:
+            self.route_total += 1
+            if router_correct:
+                self.route_pass += 1
+        
+        # Latency, overall and bucketed by endpoint
+        latency_total = trace.get("latency_ms_total")
+        latency_model = trace.get("latency_ms_model")
+        endpoint_bucket = None
+        if endpoint:
+            endpoint_bucket = self.endpoint_latencies.get(endpoint)
+            if endpoint_bucket is None:
+                endpoint_bucket = self.endpoint_latencies[endpoint] = (array('d'), array('d'))
+        
+        if latency_total is not None:
+            self.latency_total.append(latency_total)
+            if endpoint_bucket is not None:
+                endpoint_bucket[0].append(latency_total)
+        if latency_model is not None:
+            self.latency_model.append(latency_model)
+            if endpoint_bucket is not None:
+                endpoint_bucket[1].append(latency_model)
+        
+        # Adoption (session is used as user proxy if no user_id)
+        adoption_session = "anonymous" if session_id is _MISSING else session_id
+        self.unique_users.add(trace.get("user_id", adoption_session))
+        self.adoption_sessions.add(adoption_session)
+        
+        # Resolution
+        resolution_session = "default" if session_id is _MISSING else session_id
+        turns = self.resolution_by_session.get(resolution_session)
+        if turns is None:
+            turns = self.resolution_by_session[resolution_session] = [0, None]
+        turns[0] += 1
+        if turns[1] is None and trace.get("resolved", False):
+            turns[1] = turns[0]
+    
+    def match_panel_metric(self, normalized_name: str) -> Optional[str]:
+        """
+        First panel metric whose normalized name contains, or is contained in,
+        the normalized claim name; memoized per claim name
+        """
+        if normalized_name in self.panel_lookup:
+            return self.panel_lookup[normalized_name]
+        
+        match = None
+        for panel_metric, panel_normalized in self.panel_normalized:
+            if panel_normalized in normalized_name or normalized_name in panel_normalized:
+                match = panel_metric
+                break
+        
+        self.panel_lookup[normalized_name] = match
+        return match
+    
+    def grounded_accuracy_rate(self) -> Optional[float]:
+        if self.claim_total == 0:
+            return None
+        return self.claim_pass / self.claim_total
+    
+    def routing_accuracy(self) -> Optional[float]:
+        if self.route_total == 0:
+            return None
+        return self.route_pass / self.route_total
+    
+    def metric_parity_mape(self) -> Dict[str, float]:
+        mape_results = {
+            metric: total / self.metric_err_count[metric]
+            for metric, total in self.metric_err_sum.items()
+        }
+        
+        # Overall MAPE
+        if self.overall_err_count:
+            mape_results["overall"] = self.overall_err_sum / self.overall_err_count
+        
+        return mape_results
+    
+    def hallucination_rate(self) -> Optional[float]:
+        if self.total_answers == 0:
+            return None
+        return self.hallucinated_answers / self.total_answers
+    
+    def contradiction_rate(self) -> Optional[float]:
+        if len(self.claim_sessions) == 0:
+            return None
+        
+        total_sessions = len(self.claim_sessions)
+        
+        # Long-form (session, metric, value) rows in per-session timestamp order
+        row_sessions = []
+        row_metrics = []
+        row_values = []
+        
+        for session_index, session_traces in enumerate(self.claim_sessions.values()):
+            # Sort by timestamp
+            session_traces.sort(key=itemgetter(0))
+            
+            for _, claims in session_traces:
+                for claim in claims:
+                    metric_name = claim.get("name")
+                    value = claim.get("value")
+                    if metric_name and value is not None:
+                        row_sessions.append(session_index)
+                        row_metrics.append(metric_name)
+                        row_values.append(value)
+        
+        if not row_values:
+            return 0.0
+        
+        claims_df = pd.DataFrame({
+            "session": row_sessions,
+            "metric": row_metrics,
+            "value": np.asarray(row_values, dtype=np.float64)
+        })
+        
+        # Check for contradictions (successive values of a metric differ > 10%)
+        prev = claims_df.groupby(["session", "metric"], sort=False, dropna=False)["value"].shift()
+        pct_diff = (claims_df["value"] - prev).abs() / prev.abs()
+        contradicts = (prev != 0) & (pct_diff > CONTRADICTION_TOLERANCE)
+        
+        sessions_with_contradictions = claims_df.loc[contradicts, "session"].nunique()
+        
+        return sessions_with_contradictions / total_sessions
+    
+    def latency_percentiles(self, endpoint: str = None) -> Dict[str, float]:
+        if endpoint:
+            latencies_total, latencies_model = self.endpoint_latencies.get(endpoint, ((), ()))
+        else:
+            latencies_total, latencies_model = self.latency_total, self.latency_model
+        
+        return _latency_summary(latencies_total, latencies_model)
+    
+    def latency_by_endpoint(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary for every endpoint bucket filled during the pass"""
+        return {
+            endpoint: _latency_summary(latencies_total, latencies_model)
+            for endpoint, (latencies_total, latencies_model) in self.endpoint_latencies.items()
+        }
     
-    return traces
+    def adoption_metrics(self) -> Dict[str, Any]:
+        # Calculate queries per session (every trace is one query in one session)
+        if self.adoption_sessions:
+            queries_per_session = self.trace_count / len(self.adoption_sessions)
+        else:
+            queries_per_session = 0
+        
+        return {
+            "wau": len(self.unique_users),  # Weekly active users (for daily, this is DAU)
+            "sessions": len(self.adoption_sessions),
+            "queries_per_session": queries_per_session,
+            "total_queries": self.trace_count
+        }
+    
+    def resolution_metrics(self) -> Dict[str, Any]:
+        if len(self.resolution_by_session) == 0:
+            return {"sessions_resolved_rate": None, "turns_to_resolution_p50": None}
+        
+        # Turn count until first resolution, for sessions that resolved
+        turns_to_resolution = [
+            first_resolved for _, first_resolved in self.resolution_by_session.values()
+            if first_resolved is not None
+        ]
+        
+        resolution_rate = len(turns_to_resolution) / len(self.resolution_by_session)
+        
+        if turns_to_resolution:
+            turns_p50 = np.percentile(turns_to_resolution, 50)
+        else:
+            turns_p50 = None
+        
+        return {
+            "sessions_resolved_rate": resolution_rate,
+            "turns_to_resolution_p50": turns_p50
+        }
 
 
+def _accumulate(traces: Iterable[Dict[str, Any]], panel_metrics: List[str] = None) -> _RollupAccumulator:
+    """Run the fused single pass over traces"""
+    acc = _RollupAccumulator(panel_metrics)
+    for trace in traces:
+        acc.add(trace)
+    return acc
+
+
+# The compute_* functions below serve callers that need a single KPI: each
+# makes its own narrow pass that reads only the fields that KPI uses, then
+# reuses the accumulator's finalizer. rollup() uses the fused pass instead.
+
 def compute_grounded_accuracy_rate(traces: List[Dict[str, Any]]) -> float:
     """
     Calculate grounded accuracy rate: passed turns / turns with numeric claims
     """
-    turns_with_claims = []
-    
+    acc = _RollupAccumulator()
     for trace in traces:
-        extracted_metrics = trace.get("extracted_metrics", {})
+        extracted_metrics = trace.get("extracted_metrics")
         if extracted_metrics and extracted_metrics.get("has_numeric_claims"):
             grounded_pass = extracted_metrics.get("grounded_accuracy_pass")
             if grounded_pass is not None:
-                turns_with_claims.append(1 if grounded_pass else 0)
-    
-    if len(turns_with_claims) == 0:
-        return None
-    
-    return sum(turns_with_claims) / len(turns_with_claims)
+                acc.claim_total += 1
+                if grounded_pass:
+                    acc.claim_pass += 1
+    return acc.grounded_accuracy_rate()
 
 
 def compute_routing_accuracy(traces: List[Dict[str, Any]]) -> float:
     """
     Calculate routing accuracy: correct_routes / total_routed_turns
     """
-    routed_turns = []
-    
+    acc = _RollupAccumulator()
     for trace in traces:
         router_correct = trace.get("router_correct")
         if router_correct is not None:
-            routed_turns.append(1 if router_correct else 0)
-    
-    if len(routed_turns) == 0:
-        return None
-    
-    return sum(routed_turns) / len(routed_turns)
+            acc.route_total += 1
+            if router_correct:
+                acc.route_pass += 1
+    return acc.routing_accuracy()
 
 
 def compute_metric_parity_mape(traces: List[Dict[str, Any]], 
@@ -99,75 +480,37 @@ def compute_metric_parity_mape(traces: List[Dict[str, Any]],
     Returns:
         Dictionary with MAPE per metric
     """
-    if panel_metrics is None:
-        panel_metrics = [
-            "flow_efficiency", "handoffs", "throughput_minutes",
-            "aging_>14d", "case_count"
-        ]
-    
-    metric_errors = defaultdict(list)
-    
+    acc = _RollupAccumulator(panel_metrics)
     for trace in traces:
-        extracted_metrics = trace.get("extracted_metrics", {})
+        extracted_metrics = trace.get("extracted_metrics")
         if not extracted_metrics:
             continue
-        
-        verification_results = extracted_metrics.get("verification_results", [])
-        
-        for result in verification_results:
+        for result in extracted_metrics.get("verification_results", []):
             metric_name = result.get("name")
             pct_err = result.get("pct_err")
-            
             if metric_name and pct_err is not None:
-                # Normalize metric name
-                normalized_name = metric_name.lower().replace("_", "").replace(" ", "")
-                
-                # Match to panel metrics
-                for panel_metric in panel_metrics:
-                    panel_normalized = panel_metric.lower().replace("_", "").replace(" ", "")
-                    if panel_normalized in normalized_name or normalized_name in panel_normalized:
-                        metric_errors[panel_metric].append(pct_err)
-                        break
-    
-    # Compute MAPE
-    mape_results = {}
-    for metric, errors in metric_errors.items():
-        if errors:
-            mape_results[metric] = np.mean(errors)
-    
-    # Overall MAPE
-    all_errors = [err for errors in metric_errors.values() for err in errors]
-    if all_errors:
-        mape_results["overall"] = np.mean(all_errors)
-    
-    return mape_results
+                panel_metric = acc.match_panel_metric(_normalize_metric_name(metric_name))
+                if panel_metric is not None:
+                    acc.metric_err_sum[panel_metric] += pct_err
+                    acc.metric_err_count[panel_metric] += 1
+                    acc.overall_err_sum += pct_err
+                    acc.overall_err_count += 1
+    return acc.metric_parity_mape()
 
 
 def compute_hallucination_rate(traces: List[Dict[str, Any]]) -> float:
     """
     Calculate hallucination rate: answers with unknown references / total answers
     """
-    total_answers = 0
-    hallucinated_answers = 0
-    
+    acc = _RollupAccumulator()
     for trace in traces:
-        # Only count traces that generated answers
-        if trace.get("endpoint") not in ["/api/analyze", "/api/agent"]:
+        if trace.get("endpoint") not in ANSWER_ENDPOINTS:
             continue
-        
-        total_answers += 1
-        
-        # Check for hallucinations
-        extracted_metrics = trace.get("extracted_metrics", {})
-        if extracted_metrics:
-            hallucination_check = extracted_metrics.get("hallucination_check", {})
-            if hallucination_check.get("has_hallucinations"):
-                hallucinated_answers += 1
-    
-    if total_answers == 0:
-        return None
-    
-    return hallucinated_answers / total_answers
+        acc.total_answers += 1
+        extracted_metrics = trace.get("extracted_metrics")
+        if extracted_metrics and extracted_metrics.get("hallucination_check", {}).get("has_hallucinations"):
+            acc.hallucinated_answers += 1
+    return acc.hallucination_rate()
 
 
 def compute_contradiction_rate(traces: List[Dict[str, Any]]) -> float:
@@ -176,60 +519,14 @@ def compute_contradiction_rate(traces: List[Dict[str, Any]]) -> float:
     
     A contradiction occurs when two successive claims for the same metric differ > tolerance
     """
-    # Group traces by session (if session_id available)
-    sessions = defaultdict(list)
-    
+    acc = _RollupAccumulator()
     for trace in traces:
-        session_id = trace.get("session_id", "default")
-        timestamp = trace.get("timestamp_utc", "")
-        extracted_metrics = trace.get("extracted_metrics", {})
-        
+        extracted_metrics = trace.get("extracted_metrics")
         if extracted_metrics and extracted_metrics.get("has_numeric_claims"):
-            sessions[session_id].append({
-                "timestamp": timestamp,
-                "claims": extracted_metrics.get("all_claims", [])
-            })
-    
-    if len(sessions) == 0:
-        return None
-    
-    sessions_with_contradictions = 0
-    total_sessions = len(sessions)
-    
-    for session_id, session_traces in sessions.items():
-        # Sort by timestamp
-        session_traces.sort(key=lambda x: x["timestamp"])
-        
-        # Track metric values across session
-        metric_history = defaultdict(list)
-        
-        for trace in session_traces:
-            for claim in trace["claims"]:
-                metric_name = claim.get("name")
-                value = claim.get("value")
-                if metric_name and value is not None:
-                    metric_history[metric_name].append(value)
-        
-        # Check for contradictions (successive values differ > 10%)
-        has_contradiction = False
-        for metric_name, values in metric_history.items():
-            for i in range(1, len(values)):
-                prev_val = values[i-1]
-                curr_val = values[i]
-                
-                if prev_val != 0:
-                    pct_diff = abs(curr_val - prev_val) / abs(prev_val)
-                    if pct_diff > 0.10:  # 10% threshold for contradiction
-                        has_contradiction = True
-                        break
-            
-            if has_contradiction:
-                break
-        
-        if has_contradiction:
-            sessions_with_contradictions += 1
-    
-    return sessions_with_contradictions / total_sessions
+            acc.claim_sessions[trace.get("session_id", "default")].append(
+                (trace.get("timestamp_utc", ""), extracted_metrics.get("all_claims", []))
+            )
+    return acc.contradiction_rate()
 
 
 def compute_latency_percentiles(traces: List[Dict[str, Any]], 
@@ -237,121 +534,65 @@ def compute_latency_percentiles(traces: List[Dict[str, Any]],
     """
     Calculate latency percentiles (p50, p95) overall or per endpoint
     """
-    latencies_total = []
-    latencies_model = []
-    
+    latencies_total = array('d')
+    latencies_model = array('d')
     for trace in traces:
         if endpoint and trace.get("endpoint") != endpoint:
             continue
-        
         latency_total = trace.get("latency_ms_total")
-        latency_model = trace.get("latency_ms_model")
-        
         if latency_total is not None:
             latencies_total.append(latency_total)
+        latency_model = trace.get("latency_ms_model")
         if latency_model is not None:
             latencies_model.append(latency_model)
-    
-    results = {}
-    
-    if latencies_total:
-        results["p50_total"] = np.percentile(latencies_total, 50)
-        results["p95_total"] = np.percentile(latencies_total, 95)
-        results["mean_total"] = np.mean(latencies_total)
-    
-    if latencies_model:
-        results["p50_model"] = np.percentile(latencies_model, 50)
-        results["p95_model"] = np.percentile(latencies_model, 95)
-        results["mean_model"] = np.mean(latencies_model)
-    
-    return results
+    return _latency_summary(latencies_total, latencies_model)
 
 
 def compute_adoption_metrics(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Calculate adoption metrics: WAU, sessions, queries per session
     """
-    # Unique users (dedupe by some identifier - for now use session_id as proxy)
-    unique_sessions = set()
-    unique_users = set()
-    queries_by_session = defaultdict(int)
-    
+    acc = _RollupAccumulator()
     for trace in traces:
+        acc.trace_count += 1
         session_id = trace.get("session_id", "anonymous")
-        user_id = trace.get("user_id", session_id)  # Use session as proxy if no user_id
-        
-        unique_sessions.add(session_id)
-        unique_users.add(user_id)
-        queries_by_session[session_id] += 1
-    
-    # Calculate queries per session
-    if queries_by_session:
-        queries_per_session = np.mean(list(queries_by_session.values()))
-    else:
-        queries_per_session = 0
-    
-    return {
-        "wau": len(unique_users),  # Weekly active users (for daily, this is DAU)
-        "sessions": len(unique_sessions),
-        "queries_per_session": queries_per_session,
-        "total_queries": len(traces)
-    }
+        acc.unique_users.add(trace.get("user_id", session_id))
+        acc.adoption_sessions.add(session_id)
+    return acc.adoption_metrics()
 
 
 def compute_resolution_metrics(traces: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Calculate resolution metrics: resolution rate, turns to resolution
     """
-    sessions = defaultdict(list)
-    
+    acc = _RollupAccumulator()
     for trace in traces:
         session_id = trace.get("session_id", "default")
-        resolved = trace.get("resolved", False)
-        sessions[session_id].append({"resolved": resolved})
-    
-    if len(sessions) == 0:
-        return {"sessions_resolved_rate": None, "turns_to_resolution_p50": None}
-    
-    resolved_sessions = 0
-    turns_to_resolution = []
-    
-    for session_id, session_traces in sessions.items():
-        # Check if session ended with resolution
-        if any(trace["resolved"] for trace in session_traces):
-            resolved_sessions += 1
-            # Count turns until resolution
-            for i, trace in enumerate(session_traces):
-                if trace["resolved"]:
-                    turns_to_resolution.append(i + 1)
-                    break
-    
-    resolution_rate = resolved_sessions / len(sessions)
-    
-    if turns_to_resolution:
-        turns_p50 = np.percentile(turns_to_resolution, 50)
-    else:
-        turns_p50 = None
-    
-    return {
-        "sessions_resolved_rate": resolution_rate,
-        "turns_to_resolution_p50": turns_p50
-    }
+        turns = acc.resolution_by_session.get(session_id)
+        if turns is None:
+            turns = acc.resolution_by_session[session_id] = [0, None]
+        turns[0] += 1
+        if turns[1] is None and trace.get("resolved", False):
+            turns[1] = turns[0]
+    return acc.resolution_metrics()
 
 
 def rollup(day_path: Path) -> Dict[str, Any]:
     """
     Compute daily KPI rollup from trace file
     
+    Traces are streamed from disk and all KPIs are accumulated in a single
+    pass, so memory does not grow with the number of trace lines.
+    
     Args:
         day_path: Path to daily trace file (traces-YYYYMMDD.jsonl)
     
     Returns:
         Dictionary with all computed KPIs
     """
-    # Read traces
-    traces = read_traces(day_path)
+    acc = _accumulate(iter_traces(day_path))
     
-    if len(traces) == 0:
+    if acc.trace_count == 0:
         return {
             "date": day_path.stem.replace("traces-", ""),
             "trace_count": 0,
@@ -361,25 +602,20 @@ def rollup(day_path: Path) -> Dict[str, Any]:
     # Compute all KPIs
     kpis = {
         "date": day_path.stem.replace("traces-", ""),
-        "trace_count": len(traces),
-        "grounded_accuracy_rate": compute_grounded_accuracy_rate(traces),
-        "routing_accuracy": compute_routing_accuracy(traces),
-        "metric_parity_mape": compute_metric_parity_mape(traces),
-        "hallucination_rate": compute_hallucination_rate(traces),
-        "contradiction_rate": compute_contradiction_rate(traces),
+        "trace_count": acc.trace_count,
+        "grounded_accuracy_rate": acc.grounded_accuracy_rate(),
+        "routing_accuracy": acc.routing_accuracy(),
+        "metric_parity_mape": acc.metric_parity_mape(),
+        "hallucination_rate": acc.hallucination_rate(),
+        "contradiction_rate": acc.contradiction_rate(),
         "latency": {
-            "overall": compute_latency_percentiles(traces),
-            "by_endpoint": {}
+            "overall": acc.latency_percentiles(),
+            "by_endpoint": acc.latency_by_endpoint()
         },
-        "adoption": compute_adoption_metrics(traces),
-        "resolution": compute_resolution_metrics(traces)
+        "adoption": acc.adoption_metrics(),
+        "resolution": acc.resolution_metrics()
     }
     
-    # Compute per-endpoint latency
-    endpoints = set(trace.get("endpoint") for trace in traces if trace.get("endpoint"))
-    for endpoint in endpoints:
-        kpis["latency"]["by_endpoint"][endpoint] = compute_latency_percentiles(traces, endpoint)
-    
     return kpis
 
 
@@ -406,19 +642,53 @@ def rollup_today(traces_dir: Path) -> Dict[str, Any]:
     return rollup(today_file)
 
 
-def rollup_date_range(traces_dir: Path, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+def load_cached_rollup(trace_file: Path, cache_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load a saved daily rollup if it is at least as new as its trace file
+    
+    Args:
+        trace_file: Path to daily trace file (traces-YYYYMMDD.jsonl)
+        cache_dir: Directory holding kpis-YYYYMMDD.json files from save_rollup
+    
+    Returns:
+        Cached KPI dictionary, or None if missing or stale
+    """
+    date_str = trace_file.stem.replace("traces-", "")
+    cache_file = cache_dir / f"kpis-{date_str}.json"
+    
+    try:
+        if cache_file.stat().st_mtime_ns < trace_file.stat().st_mtime_ns:
+            return None
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def rollup_date_range(traces_dir: Path, start_date: date, end_date: date,
+                      max_workers: Optional[int] = 1,
+                      cache_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
     """
     Compute KPI rollups for a date range
     
+    Days are rolled up one after another unless max_workers asks for worker
+    processes. Processes are opt-in because on Windows they start by spawn
+    and re-import the caller's main module, which must then be guarded by
+    if __name__ == "__main__". With a cache_dir, days whose saved rollup is newer than
+    their trace file are loaded instead of re-parsed, and fresh rollups are saved.
+    
     Args:
         traces_dir: Directory containing trace files
         start_date: Start date
         end_date: End date
+        max_workers: Worker processes for multi-day ranges (default 1, i.e. serial;
+            None uses one per CPU)
+        cache_dir: Optional directory of saved daily rollups to reuse and update
     
     Returns:
-        List of daily KPI rollups
+        List of daily KPI rollups, in date order
     """
-    rollups = []
+    trace_files = []
     current_date = start_date
     
     while current_date <= end_date:
@@ -426,10 +696,30 @@ def rollup_date_range(traces_dir: Path, start_date: date, end_date: date) -> Lis
         trace_file = traces_dir / f"traces-{date_str}.jsonl"
         
         if trace_file.exists():
-            rollups.append(rollup(trace_file))
+            trace_files.append(trace_file)
         
         current_date += timedelta(days=1)
     
+    rollups = [None] * len(trace_files)
+    if cache_dir is not None:
+        for i, trace_file in enumerate(trace_files):
+            rollups[i] = load_cached_rollup(trace_file, cache_dir)
+    
+    pending = [i for i, kpis in enumerate(rollups) if kpis is None]
+    pending_files = [trace_files[i] for i in pending]
+    
+    if len(pending_files) <= 1 or max_workers == 1:
+        computed = [rollup(trace_file) for trace_file in pending_files]
+    else:
+        workers = min(len(pending_files), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            computed = list(executor.map(rollup, pending_files))
+    
+    for i, kpis in zip(pending, computed):
+        rollups[i] = kpis
+        if cache_dir is not None:
+            save_rollup(kpis, cache_dir)
+    
     return rollups
 
 
@@ -6,7 +6,8 @@ Extracts numeric claims from AI responses and verifies them against
 actual pandas computations for grounded accuracy and metric parity.
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Callable, List, Dict, Any, Optional, Tuple
+import json
 import re
 import pandas as pd
 from backend.metrics import (
@@ -15,6 +16,25 @@ from backend.metrics import (
 )
 
 
+# Claim extraction patterns, compiled once at import
+# Metric names use a plain (\w+): \w already covers "_", and the nested
+# (\w+(?:_\w+)*) form backtracks exponentially on long snake_case runs.
+# Pattern 1: "metric = value" or "metric: value"
+_METRIC_ASSIGN_PATTERN = re.compile(r'(\w+)\s*[=:]\s*([\d.]+)\s*([%a-zA-Z]*)', re.IGNORECASE)
+# Pattern 2: "X units by/for group"
+_SLICE_COUNT_PATTERN = re.compile(r'([\d.]+)\s+(\w+)\s+(?:by|for|in)\s+(["\']?)([^"\',.!?\n]+)\3', re.IGNORECASE)
+# Pattern 3: "average/mean/median X is Y"
+_AVERAGE_PATTERN = re.compile(r'(?:average|mean|median|avg)\s+(\w+)\s+(?:is|of|=)\s*([\d.]+)\s*([%a-zA-Z]*)', re.IGNORECASE)
+# Pattern 4: "X% of Y" or "X percent"
+_PERCENT_PATTERN = re.compile(r'([\d.]+)\s*(?:%|percent)\s+(?:of\s+)?(\w+)', re.IGNORECASE)
+# Pattern 5: ```facts JSON code blocks
+_FACTS_BLOCK_PATTERN = re.compile(r'```facts\s*\n(.*?)\n```', re.DOTALL | re.IGNORECASE)
+
+# Slice description filters ("team=X, resource=Y")
+_TEAM_FILTER_PATTERN = re.compile(r'team=([^,]+)')
+_RESOURCE_FILTER_PATTERN = re.compile(r'resource=([^,]+)')
+
+
 def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
     """
     Extract numeric claims from text
@@ -32,11 +52,18 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         List of claims with structure: {name, slice, value, units}
     """
     claims = []
+    seen = set()
+    
+    def add_claim(claim: Dict[str, Any]):
+        # Deduplicate as claims are found (keep first occurrence)
+        key = (claim["name"], claim["slice"], claim["value"])
+        if key not in seen:
+            seen.add(key)
+            claims.append(claim)
     
     # Pattern 1: "metric = value" or "metric: value"
     # Examples: "flow_efficiency = 0.62", "handoffs: 14"
-    pattern1 = r'(\w+(?:_\w+)*)\s*[=:]\s*([\d.]+)\s*([%a-zA-Z]*)'
-    matches1 = re.finditer(pattern1, text, re.IGNORECASE)
+    matches1 = _METRIC_ASSIGN_PATTERN.finditer(text)
     
     for match in matches1:
         metric_name = match.group(1).lower()
@@ -45,7 +72,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         
         try:
             numeric_value = float(value)
-            claims.append({
+            add_claim({
                 "name": metric_name,
                 "slice": None,  # No specific slice
                 "value": numeric_value,
@@ -57,8 +84,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
     
     # Pattern 2: "X units by/for group"
     # Examples: "14 handoffs for Sales-Ops", "12 cases by Team A"
-    pattern2 = r'([\d.]+)\s+(\w+)\s+(?:by|for|in)\s+(["\']?)([^"\',.!?\n]+)\3'
-    matches2 = re.finditer(pattern2, text, re.IGNORECASE)
+    matches2 = _SLICE_COUNT_PATTERN.finditer(text)
     
     for match in matches2:
         value = match.group(1)
@@ -67,7 +93,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         
         try:
             numeric_value = float(value)
-            claims.append({
+            add_claim({
                 "name": metric_name,
                 "slice": slice_name,
                 "value": numeric_value,
@@ -79,8 +105,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
     
     # Pattern 3: "average/mean/median X is Y"
     # Examples: "average duration is 45.2 seconds", "mean flow efficiency is 0.67"
-    pattern3 = r'(?:average|mean|median|avg)\s+(\w+(?:_\w+)*)\s+(?:is|of|=)\s*([\d.]+)\s*([%a-zA-Z]*)'
-    matches3 = re.finditer(pattern3, text, re.IGNORECASE)
+    matches3 = _AVERAGE_PATTERN.finditer(text)
     
     for match in matches3:
         metric_name = f"avg_{match.group(1).lower()}"
@@ -89,7 +114,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         
         try:
             numeric_value = float(value)
-            claims.append({
+            add_claim({
                 "name": metric_name,
                 "slice": None,
                 "value": numeric_value,
@@ -101,8 +126,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
     
     # Pattern 4: "X% of Y" or "X percent"
     # Examples: "62% flow efficiency", "80 percent of cases"
-    pattern4 = r'([\d.]+)\s*(?:%|percent)\s+(?:of\s+)?(\w+(?:_\w+)*)'
-    matches4 = re.finditer(pattern4, text, re.IGNORECASE)
+    matches4 = _PERCENT_PATTERN.finditer(text)
     
     for match in matches4:
         value = match.group(1)
@@ -110,7 +134,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         
         try:
             numeric_value = float(value) / 100.0  # Convert percentage to decimal
-            claims.append({
+            add_claim({
                 "name": metric_name,
                 "slice": None,
                 "value": numeric_value,
@@ -122,12 +146,10 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
     
     # Pattern 5: JSON facts block
     # Extract from ```facts code blocks
-    facts_pattern = r'```facts\s*\n(.*?)\n```'
-    facts_matches = re.finditer(facts_pattern, text, re.DOTALL | re.IGNORECASE)
+    facts_matches = _FACTS_BLOCK_PATTERN.finditer(text)
     
     for match in facts_matches:
         try:
-            import json
             facts_data = json.loads(match.group(1))
             
             if "metrics" in facts_data:
@@ -144,7 +166,7 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
                 
                 for metric_name, metric_value in facts_data["metrics"].items():
                     if isinstance(metric_value, (int, float)):
-                        claims.append({
+                        add_claim({
                             "name": metric_name,
                             "slice": slice_desc,
                             "value": float(metric_value),
@@ -155,17 +177,88 @@ def extract_numeric_claims(text: str) -> List[Dict[str, Any]]:
         except (json.JSONDecodeError, KeyError):
             pass
     
-    # Deduplicate claims (keep first occurrence)
-    unique_claims = []
-    seen = set()
-    
-    for claim in claims:
-        key = (claim["name"], claim["slice"], claim["value"])
-        if key not in seen:
-            seen.add(key)
-            unique_claims.append(claim)
+    return claims
+
+
+# Columns used by claim handlers, resolved once per recompute_metrics call
+_CLAIM_COLUMNS = {
+    "case": ["case_id", "case", "id"],
+    "duration": ["duration_seconds", "duration", "task_duration"],
+    "user": ["user", "resource", "agent_profile_id"],
+    "activity": ["activity", "step", "original_activity"],
+    "team": ["team", "teams"],
+}
+
+
+def _metric_handler(metric_fn: Callable[[pd.DataFrame, str], float]) -> Callable:
+    """Adapt a backend.metrics function to the claim handler signature"""
+    def handler(df: pd.DataFrame, dataset_name: str, columns: Dict[str, Optional[str]]) -> float:
+        return metric_fn(df, dataset_name)
+    return handler
+
+
+def _recompute_case_count(df: pd.DataFrame, dataset_name: str, columns: Dict[str, Optional[str]]) -> float:
+    """Unique cases if a case column exists, otherwise row count"""
+    case_col = columns["case"]
+    if case_col:
+        return float(df[case_col].nunique())
+    return float(len(df))
+
+
+def _unique_count(column_key: str) -> Callable:
+    """Build a handler counting unique values of a resolved column"""
+    def handler(df: pd.DataFrame, dataset_name: str, columns: Dict[str, Optional[str]]) -> Optional[float]:
+        col = columns[column_key]
+        if col:
+            return float(df[col].nunique())
+        return None
+    return handler
+
+
+def _recompute_aging(df: pd.DataFrame, dataset_name: str, metric_name: str, raw_text: str) -> Optional[int]:
+    """Aging bucket named by the claim text or metric name"""
+    aging = case_aging_buckets(df, dataset_name)
+    # Extract specific bucket if mentioned
+    if ">14d" in raw_text or "14d" in metric_name:
+        return aging.get(">14d", 0)
+    elif "8-14" in raw_text or "8_14" in metric_name:
+        return aging.get("8-14d", 0)
+    elif "0-7" in raw_text or "0_7" in metric_name:
+        return aging.get("0-7d", 0)
+    return None
+
+
+def _recompute_duration(df: pd.DataFrame, metric_name: str, duration_col: Optional[str]) -> Optional[float]:
+    """Duration statistic (mean/median/max) named by the metric; column is already numeric"""
+    if not duration_col:
+        return None
     
-    return unique_claims
+    if "avg" in metric_name or "mean" in metric_name or "average" in metric_name:
+        return df[duration_col].mean()
+    elif "median" in metric_name:
+        return df[duration_col].median()
+    elif "max" in metric_name or "maximum" in metric_name:
+        return df[duration_col].max()
+    return df[duration_col].mean()
+
+
+# Claim name aliases -> recompute handler(df, dataset_name, columns). Aging and
+# duration claims are matched by substring after this exact lookup misses.
+_METRIC_HANDLERS = (
+    (("flow_efficiency", "flow efficiency"), _metric_handler(flow_efficiency)),
+    (("handoffs", "handoff", "avg_handoffs"), _metric_handler(handoffs)),
+    (("throughput_minutes", "throughput", "avg_throughput"), _metric_handler(throughput_minutes)),
+    (("cases", "case_count", "case count"), _recompute_case_count),
+    (("users", "user_count", "unique_users"), _unique_count("user")),
+    (("activities", "activity_count", "unique_activities"), _unique_count("activity")),
+    (("teams", "team_count", "unique_teams"), _unique_count("team")),
+)
+
+_METRIC_DISPATCH = {
+    alias: handler
+    for aliases, handler in _METRIC_HANDLERS
+    for alias in aliases
+}
 
 
 def recompute_metrics(claims: List[Dict[str, Any]], 
@@ -191,9 +284,21 @@ def recompute_metrics(claims: List[Dict[str, Any]],
     if len(dataset_slice) == 0:
         return results
     
+    # Resolve claim columns once; slices keep the same columns
+    columns = {key: find_column(dataset_slice, candidates) for key, candidates in _CLAIM_COLUMNS.items()}
+    
+    # Coerce duration to numeric once rather than per claim
+    duration_col = columns["duration"]
+    if duration_col and not pd.api.types.is_numeric_dtype(dataset_slice[duration_col]):
+        dataset_slice = dataset_slice.copy()
+        dataset_slice[duration_col] = pd.to_numeric(dataset_slice[duration_col], errors="coerce")
+    
     # Compute full panel metrics once
     panel_metrics = compute_panel_metrics(dataset_slice, dataset_name, filters)
     
+    # Filtered DataFrames keyed by (team, resource) slice filters
+    sliced_dfs = {}
+    
     for claim in claims:
         metric_name = claim["name"]
         claimed_value = claim["value"]
@@ -205,78 +310,35 @@ def recompute_metrics(claims: List[Dict[str, Any]],
             # Parse slice description and apply filters
             slice_filters = {}
             if "team=" in slice_desc:
-                team_match = re.search(r'team=([^,]+)', slice_desc)
+                team_match = _TEAM_FILTER_PATTERN.search(slice_desc)
                 if team_match:
                     slice_filters["team"] = team_match.group(1).strip()
             if "resource=" in slice_desc:
-                resource_match = re.search(r'resource=([^,]+)', slice_desc)
+                resource_match = _RESOURCE_FILTER_PATTERN.search(slice_desc)
                 if resource_match:
                     slice_filters["resource"] = resource_match.group(1).strip()
             
             if slice_filters:
-                working_df = filter_dataframe(dataset_slice, slice_filters)
+                # Claims in one answer often share a slice; filter each once
+                slice_key = (slice_filters.get("team"), slice_filters.get("resource"))
+                working_df = sliced_dfs.get(slice_key)
+                if working_df is None:
+                    working_df = sliced_dfs[slice_key] = filter_dataframe(dataset_slice, slice_filters)
         
         # Recompute the metric
         recomputed_value = None
         
         try:
             # Map claim names to metric functions
-            if metric_name in ["flow_efficiency", "flow efficiency"]:
-                recomputed_value = flow_efficiency(working_df, dataset_name)
-            
-            elif metric_name in ["handoffs", "handoff", "avg_handoffs"]:
-                recomputed_value = handoffs(working_df, dataset_name)
-            
-            elif metric_name in ["throughput_minutes", "throughput", "avg_throughput"]:
-                recomputed_value = throughput_minutes(working_df, dataset_name)
+            handler = _METRIC_DISPATCH.get(metric_name)
+            if handler is not None:
+                recomputed_value = handler(working_df, dataset_name, columns)
             
             elif "aging" in metric_name or "age" in metric_name:
-                aging = case_aging_buckets(working_df, dataset_name)
-                # Extract specific bucket if mentioned
-                if ">14d" in claim.get("raw_text", "") or "14d" in metric_name:
-                    recomputed_value = aging.get(">14d", 0)
-                elif "8-14" in claim.get("raw_text", "") or "8_14" in metric_name:
-                    recomputed_value = aging.get("8-14d", 0)
-                elif "0-7" in claim.get("raw_text", "") or "0_7" in metric_name:
-                    recomputed_value = aging.get("0-7d", 0)
-            
-            elif metric_name in ["cases", "case_count", "case count"]:
-                recomputed_value = float(len(working_df))
-                # If it's case count, might need unique cases
-                case_col = find_column(working_df, ["case_id", "case", "id"])
-                if case_col:
-                    recomputed_value = float(working_df[case_col].nunique())
-            
-            elif "duration" in metric_name or metric_name in ["avg_duration", "mean_duration"]:
-                duration_col = find_column(working_df, ["duration_seconds", "duration", "task_duration"])
-                if duration_col:
-                    if not pd.api.types.is_numeric_dtype(working_df[duration_col]):
-                        working_df = working_df.copy()
-                        working_df[duration_col] = pd.to_numeric(working_df[duration_col], errors="coerce")
-                    
-                    if "avg" in metric_name or "mean" in metric_name or "average" in metric_name:
-                        recomputed_value = working_df[duration_col].mean()
-                    elif "median" in metric_name:
-                        recomputed_value = working_df[duration_col].median()
-                    elif "max" in metric_name or "maximum" in metric_name:
-                        recomputed_value = working_df[duration_col].max()
-                    else:
-                        recomputed_value = working_df[duration_col].mean()
-            
-            elif metric_name in ["users", "user_count", "unique_users"]:
-                user_col = find_column(working_df, ["user", "resource", "agent_profile_id"])
-                if user_col:
-                    recomputed_value = float(working_df[user_col].nunique())
-            
-            elif metric_name in ["activities", "activity_count", "unique_activities"]:
-                activity_col = find_column(working_df, ["activity", "step", "original_activity"])
-                if activity_col:
-                    recomputed_value = float(working_df[activity_col].nunique())
+                recomputed_value = _recompute_aging(working_df, dataset_name, metric_name, claim.get("raw_text", ""))
             
-            elif metric_name in ["teams", "team_count", "unique_teams"]:
-                team_col = find_column(working_df, ["team", "teams"])
-                if team_col:
-                    recomputed_value = float(working_df[team_col].nunique())
+            elif "duration" in metric_name:
+                recomputed_value = _recompute_duration(working_df, metric_name, duration_col)
             
             # Try to get from panel metrics if not computed
             if recomputed_value is None and metric_name in panel_metrics:
@@ -6,25 +6,84 @@ Reusable metric computation functions for task mining analysis.
 These functions match the logic used by dashboards to ensure metric parity.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+# Optional: polars backend for per-case aggregation on large frames
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Frames with at least this many rows use polars for per-case sums
+POLARS_MIN_ROWS = 100_000
+
 
 def find_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
     """Find column name from list of candidates"""
-    cols = {c.lower(): c for c in df.columns}
+    return _resolve_column(tuple(df.columns), tuple(candidates))
+
+
+@lru_cache(maxsize=256)
+def _resolve_column(columns: tuple, candidates: tuple) -> Optional[str]:
+    """Column resolution behind find_column, memoized per (columns, candidates)"""
+    cols = {c.lower(): c for c in columns}
     for cand in candidates:
         if cand.lower() in cols:
             return cols[cand.lower()]
-    for c in df.columns:
+    for c in columns:
         lc = c.lower()
         if any(cand.lower() in lc for cand in candidates):
             return c
     return None
 
 
+def _case_sums_polars(cases: pd.Series, values: pd.Series) -> Optional[np.ndarray]:
+    """Per-case sums of values via polars, or None to fall back to pandas"""
+    if not POLARS_AVAILABLE or len(cases) < POLARS_MIN_ROWS:
+        return None
+    
+    try:
+        # Hand polars plain numpy columns: integer case codes (-1 = missing case,
+        # dropped like a pandas groupby key) and float values with NaN as null
+        case_codes = pd.factorize(cases)[0]
+        value_array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        per_case = (
+            pl.DataFrame({"case": case_codes, "value": pl.Series(value_array, nan_to_null=True)})
+            .lazy()
+            .filter(pl.col("case") >= 0)
+            .group_by("case")
+            .agg(pl.col("value").sum())
+            .collect()
+        )
+    except Exception as e:
+        print(f"Polars aggregation failed, using pandas: {e}")
+        return None
+    
+    return per_case["value"].to_numpy()
+
+
+def _numeric_durations(case_df: pd.DataFrame, duration_col: str) -> pd.Series:
+    """Duration column as numbers (unparseable values become NaN), without copying the frame"""
+    durations = case_df[duration_col]
+    if not pd.api.types.is_numeric_dtype(durations):
+        durations = pd.to_numeric(durations, errors="coerce")
+    return durations
+
+
+def _case_duration_sums(cases: pd.Series, durations: pd.Series) -> np.ndarray:
+    """Per-case duration totals (rows without a case are dropped)"""
+    case_sums = _case_sums_polars(cases, durations)
+    if case_sums is None:
+        case_sums = durations.groupby(cases).sum().to_numpy()
+    return case_sums
+
+
 def flow_efficiency(case_df: pd.DataFrame, dataset: str = "salesforce") -> float:
     """
     Calculate flow efficiency: ratio of value-add time to total time
@@ -48,19 +107,16 @@ def flow_efficiency(case_df: pd.DataFrame, dataset: str = "salesforce") -> float
     if not duration_col or not case_col:
         return 0.0
     
-    # Ensure duration is numeric
-    if not pd.api.types.is_numeric_dtype(case_df[duration_col]):
-        case_df = case_df.copy()
-        case_df[duration_col] = pd.to_numeric(case_df[duration_col], errors="coerce")
-    
-    # Calculate per-case metrics
-    case_stats = case_df.groupby(case_col).agg({
-        duration_col: ['sum', 'count']
-    })
-    
     # Total work time (sum of all activity durations)
-    total_work_time = case_stats[(duration_col, 'sum')].sum()
+    durations = _numeric_durations(case_df, duration_col)
+    total_work_time = _case_duration_sums(case_df[case_col], durations).sum()
     
+    return _flow_efficiency(case_df, case_col, total_work_time)
+
+
+def _flow_efficiency(case_df: pd.DataFrame, case_col: str, total_work_time: float,
+                     start_times: Optional[pd.Series] = None) -> float:
+    """Flow efficiency from a precomputed total work time (duration already numeric)"""
     # Estimate lead time (from first to last activity per case)
     # This is a simplified calculation - ideally we'd use actual case start/end timestamps
     try:
@@ -68,26 +124,21 @@ def flow_efficiency(case_df: pd.DataFrame, dataset: str = "salesforce") -> float
         end_col = find_column(case_df, ["end_time", "end"])
         
         if start_col and end_col:
-            # Parse timestamps
-            case_lead_times = []
-            for case_id in case_df[case_col].unique():
-                case_data = case_df[case_df[case_col] == case_id]
-                if start_col in case_data.columns and end_col in case_data.columns:
-                    try:
-                        start_times = pd.to_datetime(case_data[start_col], errors='coerce')
-                        end_times = pd.to_datetime(case_data[end_col], errors='coerce')
-                        
-                        if not start_times.isna().all() and not end_times.isna().all():
-                            first_start = start_times.min()
-                            last_end = end_times.max()
-                            if pd.notna(first_start) and pd.notna(last_end):
-                                lead_time = (last_end - first_start).total_seconds()
-                                case_lead_times.append(lead_time)
-                    except:
-                        pass
+            # Parse timestamps once, then take first start / last end per case
+            case_lead_times = pd.Series(dtype=float)
+            try:
+                spans = pd.DataFrame({
+                    "start": start_times if start_times is not None
+                             else pd.to_datetime(case_df[start_col], errors='coerce'),
+                    "end": pd.to_datetime(case_df[end_col], errors='coerce')
+                }).groupby(case_df[case_col]).agg(first_start=("start", "min"), last_end=("end", "max"))
+                
+                case_lead_times = (spans["last_end"] - spans["first_start"]).dt.total_seconds().dropna()
+            except Exception:
+                pass
             
-            if case_lead_times:
-                total_lead_time = sum(case_lead_times)
+            if len(case_lead_times) > 0:
+                total_lead_time = case_lead_times.sum()
                 if total_lead_time > 0:
                     return min(1.0, total_work_time / total_lead_time)
         
@@ -124,22 +175,35 @@ def case_aging_buckets(case_df: pd.DataFrame, dataset: str = "salesforce") -> Di
         return {'0-7d': 0, '8-14d': 0, '>14d': 0}
     
     try:
-        # Get first activity timestamp per case
-        case_starts = case_df.groupby(case_col)[start_col].min()
-        case_starts = pd.to_datetime(case_starts, errors='coerce')
+        start_times = pd.to_datetime(case_df[start_col], errors='coerce')
+    except Exception:
+        return {'0-7d': 0, '8-14d': 0, '>14d': 0}
+    
+    return _case_aging_buckets(case_df[case_col], start_times)
+
+
+def _case_aging_buckets(cases: pd.Series, start_times: pd.Series) -> Dict[str, int]:
+    """Aging buckets from already-parsed start timestamps"""
+    try:
+        # First activity timestamp per case
+        case_starts = start_times.groupby(cases).min()
         
         # Calculate age from "now" (or use last activity timestamp)
         now = pd.Timestamp.now()
-        last_activity = pd.to_datetime(case_df[start_col], errors='coerce').max()
+        last_activity = start_times.max()
         if pd.notna(last_activity):
             now = last_activity
         
-        ages = (now - case_starts).dt.total_seconds() / 86400  # Convert to days
+        ages = (now - case_starts).dt.total_seconds().to_numpy() / 86400  # Convert to days
+        ages = ages[~np.isnan(ages)]
+        
+        # Bucket index per case in one pass: <=7 -> 0, (7, 14] -> 1, >14 -> 2
+        counts = np.bincount(np.digitize(ages, [7.0, 14.0], right=True), minlength=3)
         
         buckets = {
-            '0-7d': (ages <= 7).sum(),
-            '8-14d': ((ages > 7) & (ages <= 14)).sum(),
-            '>14d': (ages > 14).sum()
+            '0-7d': counts[0],
+            '8-14d': counts[1],
+            '>14d': counts[2]
         }
         
         return buckets
@@ -168,15 +232,21 @@ def throughput_minutes(case_df: pd.DataFrame, dataset: str = "salesforce") -> fl
     if not duration_col or not case_col:
         return 0.0
     
-    # Ensure duration is numeric
-    if not pd.api.types.is_numeric_dtype(case_df[duration_col]):
-        case_df = case_df.copy()
-        case_df[duration_col] = pd.to_numeric(case_df[duration_col], errors="coerce")
-    
-    # Sum duration per case and convert to minutes
-    case_throughput = case_df.groupby(case_col)[duration_col].sum()
-    avg_throughput_seconds = case_throughput.mean()
+    # Mean of per-case duration totals == total duration of rows with a case /
+    # number of cases, so no per-case series is needed
+    durations = _numeric_durations(case_df, duration_col)
+    cases = case_df[case_col]
+    n_cases = cases.nunique()
+    if n_cases == 0:
+        return np.nan
     
+    avg_throughput_seconds = durations[cases.notna()].sum() / n_cases
+    return avg_throughput_seconds / 60.0  # Convert to minutes
+
+
+def _throughput_minutes(case_sums: np.ndarray) -> float:
+    """Average per-case duration total, in minutes"""
+    avg_throughput_seconds = case_sums.mean() if case_sums.size else np.nan
     return avg_throughput_seconds / 60.0  # Convert to minutes
 
 
@@ -211,22 +281,17 @@ def handoffs(case_df: pd.DataFrame, dataset: str = "salesforce") -> float:
         
         sorted_df = case_df.sort_values(sort_cols)
         
-        # Count handoffs per case (transitions between different users)
-        handoff_counts = []
+        # Count handoffs (transitions between different users) across adjacent
+        # rows of the same case; rows of a case are contiguous after the sort
+        cases = sorted_df[case_col].to_numpy()
+        users = sorted_df[user_col].to_numpy()
         
-        for case_id in sorted_df[case_col].unique():
-            case_data = sorted_df[sorted_df[case_col] == case_id]
-            users = case_data[user_col].tolist()
-            
-            # Count transitions where user changes
-            handoff_count = 0
-            for i in range(1, len(users)):
-                if users[i] != users[i-1]:
-                    handoff_count += 1
-            
-            handoff_counts.append(handoff_count)
+        same_case = cases[1:] == cases[:-1]
+        user_changed = users[1:] != users[:-1]
+        total_handoffs = int(np.count_nonzero(same_case & user_changed))
         
-        return np.mean(handoff_counts) if handoff_counts else 0.0
+        n_cases = len(sorted_df[case_col].unique())
+        return total_handoffs / n_cases if n_cases else 0.0
     
     except Exception:
         return 0.0
@@ -245,38 +310,62 @@ def compute_panel_metrics(case_df: pd.DataFrame, dataset: str = "salesforce",
     Returns:
         Dictionary with computed metrics
     """
+    duration_col = find_column(case_df, ["duration_seconds", "duration", "task_duration", "elapsed"])
+    case_col = find_column(case_df, ["case_id", "case", "id"])
+    
+    # Coerce duration once for every metric below
+    durations = _numeric_durations(case_df, duration_col) if duration_col else None
+    
+    # Parse start timestamps once for flow efficiency and aging
+    start_col = find_column(case_df, ["start_time", "start", "timestamp"])
+    start_times = None
+    if len(case_df) > 0 and case_col and start_col:
+        try:
+            start_times = pd.to_datetime(case_df[start_col], errors='coerce')
+        except Exception:
+            pass
+    
+    if len(case_df) > 0 and duration_col and case_col:
+        # One per-case duration groupby feeds both flow efficiency and throughput
+        case_sums = _case_duration_sums(case_df[case_col], durations)
+        flow = _flow_efficiency(case_df, case_col, case_sums.sum(), start_times)
+        throughput = _throughput_minutes(case_sums)
+    else:
+        # Same result flow_efficiency/throughput_minutes give without these inputs
+        flow = throughput = 0.0
+    
     metrics = {
         "dataset": dataset,
         "filters": filters or {},
         "case_count": len(case_df),
-        "flow_efficiency": flow_efficiency(case_df, dataset),
-        "throughput_minutes": throughput_minutes(case_df, dataset),
+        "flow_efficiency": flow,
+        "throughput_minutes": throughput,
         "handoffs": handoffs(case_df, dataset),
-        "aging_buckets": case_aging_buckets(case_df, dataset)
+        "aging_buckets": (_case_aging_buckets(case_df[case_col], start_times)
+                          if start_times is not None else case_aging_buckets(case_df, dataset))
     }
     
     # Add basic statistics
-    duration_col = find_column(case_df, ["duration_seconds", "duration", "task_duration", "elapsed"])
     if duration_col:
-        if not pd.api.types.is_numeric_dtype(case_df[duration_col]):
-            case_df = case_df.copy()
-            case_df[duration_col] = pd.to_numeric(case_df[duration_col], errors="coerce")
-        
-        metrics["avg_duration_seconds"] = case_df[duration_col].mean()
-        metrics["median_duration_seconds"] = case_df[duration_col].median()
-        metrics["max_duration_seconds"] = case_df[duration_col].max()
+        metrics["avg_duration_seconds"] = durations.mean()
+        metrics["median_duration_seconds"] = durations.median()
+        metrics["max_duration_seconds"] = durations.max()
     
     # Add activity statistics
     activity_col = find_column(case_df, ["activity", "step", "original_activity"])
     if activity_col:
-        metrics["unique_activities"] = case_df[activity_col].nunique()
-        top_activity = case_df[activity_col].value_counts().index[0] if len(case_df) > 0 else None
+        # One hash pass gives both the distinct count and the per-value counts
+        codes, uniques = pd.factorize(case_df[activity_col], sort=False)
+        metrics["unique_activities"] = len(uniques)
+        codes = codes[codes >= 0]
+        # argmax keeps the first-seen value on ties, matching value_counts order
+        top_activity = uniques[np.bincount(codes).argmax()] if codes.size else None
         metrics["most_common_activity"] = str(top_activity) if top_activity else None
     
     # Add user statistics
     user_col = find_column(case_df, ["user", "resource", "agent_profile_id", "agent"])
     if user_col:
-        metrics["unique_users"] = case_df[user_col].nunique()
+        metrics["unique_users"] = len(pd.factorize(case_df[user_col], sort=False)[1])
     
     return metrics
 
@@ -292,30 +381,31 @@ def filter_dataframe(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
     Returns:
         Filtered dataframe
     """
-    filtered_df = df.copy()
+    # Build one row mask across all filters and select rows once
+    mask = np.ones(len(df), dtype=bool)
     
     # Case ID filter
     if filters.get("case_id"):
         case_col = find_column(df, ["case_id", "case", "id"])
         if case_col:
             case_ids = filters["case_id"] if isinstance(filters["case_id"], list) else [filters["case_id"]]
-            filtered_df = filtered_df[filtered_df[case_col].isin(case_ids)]
+            mask &= df[case_col].isin(case_ids).to_numpy()
     
     # Team filter
     if filters.get("team"):
         team_col = find_column(df, ["team", "teams"])
         if team_col:
             teams = filters["team"] if isinstance(filters["team"], list) else [filters["team"]]
-            filtered_df = filtered_df[filtered_df[team_col].isin(teams)]
+            mask &= df[team_col].isin(teams).to_numpy()
     
     # Resource/User filter
     if filters.get("resource"):
         user_col = find_column(df, ["user", "resource", "agent_profile_id", "agent"])
         if user_col:
             resources = filters["resource"] if isinstance(filters["resource"], list) else [filters["resource"]]
-            filtered_df = filtered_df[filtered_df[user_col].isin(resources)]
+            mask &= df[user_col].isin(resources).to_numpy()
     
-    # Time range filter
+    # Time range filter (timestamps parsed only for rows still selected)
     if filters.get("time_range"):
         time_col = find_column(df, ["start_time", "start", "timestamp"])
         if time_col:
@@ -325,14 +415,17 @@ def filter_dataframe(df: pd.DataFrame, filters: Dict[str, Any]) -> pd.DataFrame:
                     start = pd.to_datetime(time_range.get("start"), errors='coerce')
                     end = pd.to_datetime(time_range.get("end"), errors='coerce')
                     
-                    timestamps = pd.to_datetime(filtered_df[time_col], errors='coerce')
+                    selected = np.flatnonzero(mask)
+                    timestamps = pd.to_datetime(df[time_col].iloc[selected], errors='coerce')
                     
                     if pd.notna(start):
-                        filtered_df = filtered_df[timestamps >= start]
+                        mask[selected] &= (timestamps >= start).to_numpy()
                     if pd.notna(end):
-                        filtered_df = filtered_df[timestamps <= end]
+                        mask[selected] &= (timestamps <= end).to_numpy()
             except:
                 pass
     
+    filtered_df = df[mask]
+    
     return filtered_df
 
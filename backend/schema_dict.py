@@ -7,11 +7,45 @@ when AI responses reference unknown columns, teams, activities, or other entitie
 """
 
 from typing import Dict, Set, Optional, Any
-from functools import lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
+import os
+import re
+import threading
 import pandas as pd
 import time
 
 
+# Quoted spans in AI responses (often team names, activities, etc.); double and
+# single quotes are scanned independently so an apostrophe inside "..." still
+# leaves the double-quoted span intact
+_DOUBLE_QUOTED_PATTERN = re.compile(r'"([^"]+)"')
+_SINGLE_QUOTED_PATTERN = re.compile(r"'([^']+)'")
+
+# Punctuation stripped from each whitespace-separated word
+_WORD_STRIP_CHARS = ',.!?;:"()[]{}'
+
+# Entity sets per dataset and the candidate columns each is read from
+_ENTITY_COLUMNS = {
+    "salesforce": [
+        ("activities", ["activity", "step", "original_activity"]),
+        ("teams", ["team", "teams"]),
+        ("users", ["user", "resource", "agent_profile_id"]),
+        ("processes", ["process_name", "process", "application", "window"]),
+        ("window_titles", ["window_title", "title"])
+    ],
+    "amadeus": [
+        ("activities", ["activity", "step"]),
+        ("teams", ["team"]),
+        ("users", ["resource", "user", "agent"]),
+        ("processes", ["process_name", "application", "process"]),
+        ("window_titles", ["title", "window_title"])
+    ]
+}
+
+
 class SchemaDict:
     """Schema dictionary for detecting hallucinations in AI responses"""
     
@@ -21,83 +55,58 @@ class SchemaDict:
         self.amadeus_df = amadeus_df
         self.last_refresh = time.time()
         self.cache_ttl = 600  # 10 minutes
+        self._version = 0  # Bumped on every rebuild so cached validations expire
         
         self._schema = self._build_schema()
+        self._lookups = self._build_lookups()
     
     def _build_schema(self) -> Dict[str, Dict[str, Set[str]]]:
         """Build schema dictionary from both datasets"""
         schema = {
-            "salesforce": {
-                "columns": set(),
-                "activities": set(),
-                "teams": set(),
-                "users": set(),
-                "processes": set(),
-                "window_titles": set()
-            },
-            "amadeus": {
-                "columns": set(),
-                "activities": set(),
-                "teams": set(),
-                "users": set(),
-                "processes": set(),
-                "window_titles": set()
-            }
+            dataset: {"columns": set(), **{entity: set() for entity, _ in _ENTITY_COLUMNS[dataset]}}
+            for dataset in _ENTITY_COLUMNS
         }
         
-        # Build Salesforce schema
-        if self.salesforce_df is not None:
-            df = self.salesforce_df
-            schema["salesforce"]["columns"] = set(df.columns)
-            
-            # Extract unique values for key columns
-            activity_col = self._find_column(df, ["activity", "step", "original_activity"])
-            if activity_col:
-                schema["salesforce"]["activities"] = set(df[activity_col].dropna().unique())
-            
-            team_col = self._find_column(df, ["team", "teams"])
-            if team_col:
-                schema["salesforce"]["teams"] = set(df[team_col].dropna().unique())
-            
-            user_col = self._find_column(df, ["user", "resource", "agent_profile_id"])
-            if user_col:
-                schema["salesforce"]["users"] = set(df[user_col].dropna().unique())
-            
-            process_col = self._find_column(df, ["process_name", "process", "application", "window"])
-            if process_col:
-                schema["salesforce"]["processes"] = set(df[process_col].dropna().unique())
-            
-            title_col = self._find_column(df, ["window_title", "title"])
-            if title_col:
-                schema["salesforce"]["window_titles"] = set(df[title_col].dropna().unique())
+        # One unique-value scan per (dataset, entity) column; the scans are
+        # independent, so run them on a thread pool
+        tasks = []
+        for dataset, df in (("salesforce", self.salesforce_df), ("amadeus", self.amadeus_df)):
+            if df is None:
+                continue
+            schema[dataset]["columns"] = set(df.columns)
+            for entity, candidates in _ENTITY_COLUMNS[dataset]:
+                col = self._find_column(df, candidates)
+                if col:
+                    tasks.append((dataset, entity, df[col]))
         
-        # Build Amadeus schema
-        if self.amadeus_df is not None:
-            df = self.amadeus_df
-            schema["amadeus"]["columns"] = set(df.columns)
-            
-            activity_col = self._find_column(df, ["activity", "step"])
-            if activity_col:
-                schema["amadeus"]["activities"] = set(df[activity_col].dropna().unique())
-            
-            team_col = self._find_column(df, ["team"])
-            if team_col:
-                schema["amadeus"]["teams"] = set(df[team_col].dropna().unique())
-            
-            user_col = self._find_column(df, ["resource", "user", "agent"])
-            if user_col:
-                schema["amadeus"]["users"] = set(df[user_col].dropna().unique())
-            
-            process_col = self._find_column(df, ["process_name", "application", "process"])
-            if process_col:
-                schema["amadeus"]["processes"] = set(df[process_col].dropna().unique())
-            
-            title_col = self._find_column(df, ["title", "window_title"])
-            if title_col:
-                schema["amadeus"]["window_titles"] = set(df[title_col].dropna().unique())
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                values = list(executor.map(lambda task: self._unique_values(task[2]), tasks))
+        else:
+            values = [self._unique_values(series) for _, _, series in tasks]
+        
+        for (dataset, entity, _), entity_values in zip(tasks, values):
+            schema[dataset][entity] = entity_values
         
         return schema
     
+    def _unique_values(self, series: pd.Series) -> Set[Any]:
+        """Distinct non-null values of a column (reads codes directly for categoricals)"""
+        # factorize drops nulls itself, so no dropna() copy of the column is made
+        return set(pd.factorize(series, sort=False)[1])
+    
+    def _build_lookups(self) -> Dict[str, Dict[str, frozenset]]:
+        """Build lowercased lookup sets used by validate_references"""
+        return {
+            dataset: {
+                "columns": frozenset(col.lower() for col in entities["columns"]),
+                "teams": frozenset(str(t).lower() for t in entities["teams"]),
+                "activities": frozenset(str(a).lower() for a in entities["activities"])
+            }
+            for dataset, entities in self._schema.items()
+        }
+    
     def _find_column(self, df: pd.DataFrame, candidates: list) -> Optional[str]:
         """Find column name from list of candidates"""
         cols = {c.lower(): c for c in df.columns}
@@ -114,6 +123,8 @@ class SchemaDict:
         """Refresh schema cache if TTL expired"""
         if time.time() - self.last_refresh > self.cache_ttl:
             self._schema = self._build_schema()
+            self._lookups = self._build_lookups()
+            self._version += 1
             self.last_refresh = time.time()
     
     def get_schema(self, dataset: str = None) -> Dict[str, Any]:
@@ -141,61 +152,64 @@ class SchemaDict:
             }
         
         schema = self._schema[dataset]
+        lookups = self._lookups[dataset]
+        col_names_lower = lookups["columns"]
+        teams_lower = lookups["teams"]
+        activities_lower = lookups["activities"]
         unknown_entities = []
         text_lower = text.lower()
         
         # Check for column references
         # Look for patterns like "column_name" or mentioned columns
         for word in text.split():
-            cleaned_word = word.strip(',.!?;:"()[]{}')
+            cleaned_word = word.strip(_WORD_STRIP_CHARS)
             
             # Check if word matches any known column
-            if cleaned_word and len(cleaned_word) > 2:
+            if len(cleaned_word) > 2:
                 # Check columns (case-insensitive)
-                col_names_lower = {col.lower() for col in schema["columns"]}
                 if cleaned_word.lower() in col_names_lower:
                     continue  # Valid column reference
                 
                 # Check if it's a potential column reference (contains underscore or camelCase)
                 if '_' in cleaned_word or (cleaned_word[0].islower() and any(c.isupper() for c in cleaned_word)):
-                    # Might be a column reference - check if it exists
-                    if cleaned_word.lower() not in col_names_lower:
-                        # Could be hallucinated column
-                        unknown_entities.append({
-                            "type": "column",
-                            "value": cleaned_word,
-                            "context": "potential_column_reference"
-                        })
+                    # Not a known column - could be hallucinated
+                    unknown_entities.append({
+                        "type": "column",
+                        "value": cleaned_word,
+                        "context": "potential_column_reference"
+                    })
         
-        # Extract quoted strings (often team names, activities, etc.)
-        import re
-        quoted_strings = re.findall(r'"([^"]+)"', text) + re.findall(r"'([^']+)'", text)
+        # Quoted strings can only be reported when the text talks about teams or
+        # activities (and that entity set is known), so decide that once up front
+        check_teams = len(teams_lower) > 0 and ("team" in text_lower or "group" in text_lower)
+        check_activities = len(activities_lower) > 0 and (
+            "activity" in text_lower or "step" in text_lower or "process" in text_lower
+        )
+        if check_teams or check_activities:
+            quoted_strings = _DOUBLE_QUOTED_PATTERN.findall(text) + _SINGLE_QUOTED_PATTERN.findall(text)
+        else:
+            quoted_strings = []
         
         for quoted in quoted_strings:
-            # Check if it matches known teams
-            if quoted not in schema["teams"] and len(schema["teams"]) > 0:
-                # Check case-insensitive
-                teams_lower = {str(t).lower() for t in schema["teams"]}
-                if quoted.lower() not in teams_lower:
-                    # Could be hallucinated team
-                    if "team" in text_lower or "group" in text_lower:
-                        unknown_entities.append({
-                            "type": "team",
-                            "value": quoted,
-                            "context": "quoted_team_reference"
-                        })
+            quoted_lower = quoted.lower()
+            
+            # Check if it matches known teams (exact, then case-insensitive)
+            if check_teams and quoted not in schema["teams"] and quoted_lower not in teams_lower:
+                # Could be hallucinated team
+                unknown_entities.append({
+                    "type": "team",
+                    "value": quoted,
+                    "context": "quoted_team_reference"
+                })
             
             # Check if it matches known activities
-            if quoted not in schema["activities"] and len(schema["activities"]) > 0:
-                activities_lower = {str(a).lower() for a in schema["activities"]}
-                if quoted.lower() not in activities_lower:
-                    # Could be hallucinated activity
-                    if "activity" in text_lower or "step" in text_lower or "process" in text_lower:
-                        unknown_entities.append({
-                            "type": "activity",
-                            "value": quoted,
-                            "context": "quoted_activity_reference"
-                        })
+            if check_activities and quoted not in schema["activities"] and quoted_lower not in activities_lower:
+                # Could be hallucinated activity
+                unknown_entities.append({
+                    "type": "activity",
+                    "value": quoted,
+                    "context": "quoted_activity_reference"
+                })
         
         return {
             "has_hallucinations": len(unknown_entities) > 0,
@@ -215,6 +229,11 @@ class SchemaDict:
 # Global schema dictionary instance (will be initialized at app startup)
 _global_schema_dict: Optional[SchemaDict] = None
 
+# Validation results keyed by (text digest, dataset, schema version)
+_VALIDATION_CACHE_SIZE = 1024
+_validation_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
 
 def build_schema_dict(salesforce_df: Optional[pd.DataFrame] = None,
                       amadeus_df: Optional[pd.DataFrame] = None) -> SchemaDict:
@@ -230,6 +249,8 @@ def build_schema_dict(salesforce_df: Optional[pd.DataFrame] = None,
     """
     global _global_schema_dict
     _global_schema_dict = SchemaDict(salesforce_df, amadeus_df)
+    with _validation_cache_lock:
+        _validation_cache.clear()  # Results from the previous instance no longer apply
     return _global_schema_dict
 
 
@@ -238,10 +259,19 @@ def get_schema_dict() -> Optional[SchemaDict]:
     return _global_schema_dict
 
 
-@lru_cache(maxsize=128)
-def cached_validate_references(text_hash: int, dataset: str) -> Dict[str, Any]:
-    """Cached validation of references (keyed by text hash)"""
-    if _global_schema_dict is None:
+def cached_validate_references(text: str, dataset: str) -> Dict[str, Any]:
+    """
+    Cached validation of references (keyed by a hash of the text)
+    
+    Args:
+        text: AI response text to validate
+        dataset: Dataset identifier
+    
+    Returns:
+        Dict with hallucination detection results (a copy the caller may modify)
+    """
+    schema_dict = _global_schema_dict
+    if schema_dict is None:
         return {
             "has_hallucinations": False,
             "unknown_entities": [],
@@ -249,6 +279,22 @@ def cached_validate_references(text_hash: int, dataset: str) -> Dict[str, Any]:
             "reason": "Schema dictionary not initialized"
         }
     
-    # This is a simplified cache - in production you'd want better hash handling
-    return _global_schema_dict.validate_references(str(text_hash), dataset)
-
+    # Refresh first so the key carries the version validation will run against
+    schema_dict.refresh_if_needed()
+    key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(),
+           dataset, schema_dict._version)
+    
+    with _validation_cache_lock:
+        result = _validation_cache.get(key)
+        if result is not None:
+            _validation_cache.move_to_end(key)
+            return copy.deepcopy(result)
+    
+    result = schema_dict.validate_references(text, dataset)
+    
+    with _validation_cache_lock:
+        _validation_cache[key] = result
+        if len(_validation_cache) > _VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    
+    return copy.deepcopy(result)
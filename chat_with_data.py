@@ -6,18 +6,36 @@ This allows users to ask natural language questions about their data.
 
 import os
 import sys
+import re
+import json
+import logging
+import pickle
+import atexit
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from dotenv import load_dotenv
-import openai
 from datetime import datetime
 
 # Load environment variables
-load_dotenv()
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
 
 # Add current directory to path
 sys.path.append('.')
 
+# Background work (prefetch) reports here instead of printing over the prompt;
+# silent unless the application configures logging
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
 try:
     from task_mining_multi_agent import (
         SalesforceAgent, AmadeusAgent, load_csv, 
@@ -28,6 +46,273 @@ except ImportError as e:
     print(f"[ERROR] Failed to import modules: {e}")
     sys.exit(1)
 
+# Optional: line editing with persistent question history
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import FileHistory
+    PROMPT_TOOLKIT_AVAILABLE = True
+except ImportError:
+    PROMPT_TOOLKIT_AVAILABLE = False
+
+CHAT_HISTORY_PATH = os.path.join(BASE_DIR, ".chat_history")
+
+# Optional: parquet cache of parsed CSVs (needs pyarrow)
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CSV_CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+
+# AI response cache: exact matches on the normalized question, plus a semantic
+# tier that reuses answers to questions whose embeddings are close enough
+LLM_CACHE_PATH = os.path.join(BASE_DIR, ".llm_cache.pkl")
+LLM_CACHE_SIZE = 256
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+
+# Words that flip or narrow what a question asks for. Close embeddings do not
+# separate "which user is fastest" from "which user is slowest", so a semantic
+# hit is only reused when both questions use the same key terms.
+_KEY_TERMS = {
+    "most": "most", "more": "most", "least": "least", "less": "least", "fewest": "least",
+    "fastest": "fast", "faster": "fast", "quickest": "fast", "slowest": "slow", "slower": "slow",
+    "longest": "long", "longer": "long", "shortest": "short", "shorter": "short",
+    "highest": "high", "higher": "high", "lowest": "low", "lower": "low",
+    "best": "best", "better": "best", "worst": "worst", "worse": "worst",
+    "top": "top", "bottom": "bottom", "busiest": "busy", "max": "max", "maximum": "max",
+    "min": "min", "minimum": "min", "average": "mean", "mean": "mean", "median": "median",
+    "total": "total", "common": "common", "rare": "rare", "rarest": "rare",
+    "user": "user", "users": "user", "resource": "user", "resources": "user",
+    "team": "team", "teams": "team", "activity": "activity", "activities": "activity",
+    "app": "app", "apps": "app", "application": "app", "applications": "app",
+    "bottleneck": "bottleneck", "bottlenecks": "bottleneck", "case": "case", "cases": "case",
+}
+
+
+def question_key_terms(question):
+    """Canonical key terms of a question (see _KEY_TERMS)"""
+    return frozenset(_KEY_TERMS[word] for word in re.findall(r"\w+", question.lower()) if word in _KEY_TERMS)
+
+# Sample questions shown to the user (their embeddings are fetched at startup)
+SAMPLE_QUESTIONS = [
+    "Who is the most active user?",
+    "What are the longest-running activities?",
+    "Which team performs best?",
+    "What applications are used most?",
+    "What are the main bottlenecks?",
+    "How many unique users do we have?",
+    "What's the average task duration?",
+    "Which activities take the longest time?",
+    "Compare performance between teams",
+    "What are the top 5 most common activities?"
+]
+# The 'help' text, joined once so it is written in a single call
+SAMPLE_QUESTIONS_TEXT = "\nSample questions you can ask:\n" + "\n".join(
+    f"  - {question}" for question in SAMPLE_QUESTIONS)
+
+# Likely follow-up questions answered in the background while the user types.
+# Each one is a paid completion, so prefetching is opt-in (CHAT_PREFETCH=true)
+PREFETCH_ENABLED = os.getenv('CHAT_PREFETCH', 'false').lower() in ('1', 'true', 'yes')
+PREFETCH_QUESTIONS = [
+    "What are the longest-running activities?",
+    "Which team performs best?",
+    "What applications are used most?",
+    "What are the main bottlenecks?",
+    "Compare performance between teams"
+]
+PREFETCH_COUNT = 3
+
+# Prompt size: ranked stats are cut to the top entries and floats rounded
+PROMPT_TOP_N = 5
+PROMPT_FLOAT_DIGITS = 2
+_RANKED_STATS = ("longest_activities", "team_performance", "app_usage")
+
+# Questions the precomputed statistics answer directly, without an AI call.
+# Patterns are matched against the whole normalized question so that longer
+# questions ("...and why?") still go to the model.
+_Q_PREFIX = r"(?:(?:who|what|which) (?:is|are) |whos |whats |how many )?(?:the )?(?:number of )?"
+# Count questions need an explicit cue, otherwise "who are the users?" would
+# be answered with a number
+_COUNT_PREFIX = (r"(?:(?:how many |(?:(?:what|which) is |whats )?(?:the )?number of )(?:unique |distinct )?"
+                 r"|" + _Q_PREFIX + r"(?:unique |distinct ))")
+DIRECT_INTENTS = [
+    (re.compile(_Q_PREFIX + r"most active (?:user|resource)"),
+     lambda s: f"{s['most_active_user']} ({s['most_active_count']} events)" if s.get("most_active_user") is not None else None),
+    (re.compile(_COUNT_PREFIX + r"users(?: do we have| are there)?"),
+     lambda s: f"{s['unique_users']} unique users"),
+    (re.compile(_COUNT_PREFIX + r"activities(?: do we have| are there)?"),
+     lambda s: f"{s['unique_activities']} unique activities"),
+    (re.compile(_Q_PREFIX + r"average (?:task )?duration"),
+     lambda s: f"{float(s['avg_duration']):.2f} seconds"),
+]
+
+SYSTEM_PROMPT = (
+    "You are an expert task mining analyst. You receive a user question and JSON data "
+    "analysis results for the loaded datasets. Provide a clear, actionable answer based on "
+    "this data. Include specific numbers, insights, and recommendations where relevant. "
+    "Be conversational and helpful."
+)
+
+
+def load_csv_cached(path):
+    """
+    load_csv with a parquet copy of the parsed frame reused on later runs
+    
+    Args:
+        path: CSV file path
+    
+    Returns:
+        Parsed DataFrame (identical to load_csv)
+    """
+    if not PYARROW_AVAILABLE:
+        return load_csv(path)
+    
+    # Key on path, size and mtime so an edited CSV gets a fresh cache entry
+    stat = os.stat(path)
+    signature = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    cache_path = os.path.join(CSV_CACHE_DIR, hashlib.sha1(signature.encode("utf-8")).hexdigest() + ".parquet")
+    
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable CSV cache {cache_path}: {e}")
+    
+    df = load_csv(path)
+    try:
+        os.makedirs(CSV_CACHE_DIR, exist_ok=True)
+        df.to_parquet(cache_path, compression="zstd")
+    except Exception as e:
+        print(f"[WARNING] Failed to cache parsed CSV: {e}")
+    return df
+
+
+def project_agent_frame(agent):
+    """
+    Keep only the columns the chat statistics read in the agent's DataFrame
+    
+    Args:
+        agent: Loaded agent whose .df is replaced
+    """
+    used = []
+    for attr in ("user_col", "duration_col", "activity_col", "team_col", "app_col"):
+        col = getattr(agent, attr, None)
+        if col and col not in used:
+            used.append(col)
+    
+    agent.df = agent.df[used].copy()
+
+
+def downcast_agent_frame(agent):
+    """
+    Shrink an agent's DataFrame in place for the chat session
+    
+    Float/int columns are narrowed to 32-bit (or smaller) types and the
+    grouping columns the statistics use are stored as categoricals. The
+    duration column is a measure that feeds every average in the prompt, so
+    it keeps its loaded dtype rather than lose precision to float32.
+    
+    Args:
+        agent: Loaded agent whose .df is modified
+    """
+    df = agent.df
+    measures = {agent.duration_col}
+    
+    for col in df.select_dtypes(include="float64").columns:
+        if col not in measures:
+            df[col] = df[col].astype(np.float32)
+    for col in df.select_dtypes(include="int64").columns:
+        if col not in measures:
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+    
+    for attr in ("user_col", "team_col", "app_col", "activity_col"):
+        col = getattr(agent, attr, None)
+        if col and not isinstance(df[col].dtype, pd.CategoricalDtype) and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+
+
+def attach_column_arrays(agent):
+    """
+    Store the columns the statistics use as plain NumPy arrays on the agent
+    
+    Key columns become factorized codes plus their distinct values
+    (agent.user_codes/agent.user_uniq and likewise for activity, team and
+    app); the duration column becomes agent.duration_vals. The projected
+    DataFrame stays on agent.df, where only its row count is still read.
+    
+    Args:
+        agent: Loaded agent whose .df has already been projected and downcast
+    """
+    df = agent.df
+    
+    # Means are grouped in sorted key order, counts in first-seen order
+    for name, sort in (("user", False), ("app", False), ("activity", True), ("team", True)):
+        col = getattr(agent, f"{name}_col", None)
+        codes, uniques = pd.factorize(df[col], sort=sort) if col else (None, None)
+        setattr(agent, f"{name}_codes", codes)
+        setattr(agent, f"{name}_uniq", uniques)
+    
+    duration_col = agent.duration_col
+    agent.duration_vals = (df[duration_col].to_numpy(dtype=np.float64, na_value=np.nan)
+                           if duration_col else None)
+
+
+def _slim(value):
+    """Round floats and unwrap numpy scalars so analysis results serialize compactly"""
+    if isinstance(value, dict):
+        return {str(k): _slim(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_slim(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return round(value, PROMPT_FLOAT_DIGITS)
+    return value
+
+
+def compact_analysis(data_analysis):
+    """
+    Serialize analysis results for the prompt as minified JSON
+    
+    Args:
+        data_analysis: Output of DataChatBot.analyze_data_for_question
+    
+    Returns:
+        JSON string with ranked stats cut to the top PROMPT_TOP_N entries
+    """
+    slimmed = {}
+    for dataset_name, analysis in data_analysis.items():
+        stats = dict(analysis.get("stats", {}))
+        for key in _RANKED_STATS:
+            if isinstance(stats.get(key), dict):
+                stats[key] = dict(itertools.islice(stats[key].items(), PROMPT_TOP_N))
+        slimmed[dataset_name] = {"info": analysis.get("info"), "stats": stats}
+    
+    return json.dumps(_slim(slimmed), separators=(",", ":"), default=str)
+
+
+def _value_counts(codes, uniques):
+    """value_counts() from factorized codes (same order: count desc, first seen on ties)"""
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    order = np.argsort(-counts, kind="stable")
+    return pd.Series(counts[order], index=uniques[order])
+
+
+def _group_mean(codes, uniques, values):
+    """groupby(keys)[values].mean() from factorized keys, NaN values skipped"""
+    valid = codes >= 0
+    codes = codes[valid]
+    numbers = values[valid].astype(np.float64)
+    present = ~np.isnan(numbers)
+    
+    sums = np.bincount(codes, weights=np.where(present, numbers, 0.0), minlength=len(uniques))
+    counts = np.bincount(codes, weights=present, minlength=len(uniques))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return pd.Series(means, index=uniques)
+
 class DataChatBot:
     def __init__(self):
         """Initialize the chat bot with data and OpenAI"""
@@ -36,11 +321,32 @@ class DataChatBot:
         self.current_dataset = None
         self.openai_client = None
         
+        # Per-dataset info and statistics, computed once when the data is loaded
+        self._info_cache = {}
+        self._stats_cache = {}
+        self._source_signatures = {}
+        
         # Initialize OpenAI
         self.setup_openai()
         
         # Load data
         self.load_data()
+        
+        # Load cached AI responses (dropped if the datasets changed); the lock
+        # guards the caches against the warm-up and prefetch threads
+        self._cache_lock = threading.RLock()
+        self._response_cache = self._load_response_cache()
+        self._prefetch_thread = None
+        
+        # New responses are written out once at exit rather than on every insert
+        self._cache_dirty = False
+        atexit.register(self._save_response_cache)
+        
+        # Question embeddings by cache key; sample questions are embedded up front
+        # in one batched request so asking one skips the embedding round-trip
+        self._embedding_memo = {}
+        if self.openai_client:
+            threading.Thread(target=self._warm_embeddings, daemon=True).start()
     
     def setup_openai(self):
         """Setup OpenAI client"""
@@ -51,45 +357,85 @@ class DataChatBot:
             return
         
         try:
-            self.openai_client = openai.OpenAI(api_key=api_key)
+            # Imported here so startup does not pay for the OpenAI SDK before the banner
+            import openai
+            self.openai_client = openai.OpenAI(api_key=api_key, http_client=self._build_http_client())
             print("[OK] OpenAI client initialized")
         except Exception as e:
             print(f"[ERROR] Failed to initialize OpenAI: {e}")
     
+    def _build_http_client(self):
+        """Pooled keep-alive HTTP client for the OpenAI API (HTTP/2 when h2 is installed)"""
+        import httpx
+        options = {
+            "timeout": httpx.Timeout(60.0, connect=5.0),
+            "limits": httpx.Limits(max_keepalive_connections=8, max_connections=8)
+        }
+        try:
+            return httpx.Client(http2=True, **options)
+        except ImportError:
+            # httpx needs the optional 'h2' package for HTTP/2
+            return httpx.Client(**options)
+    
     def load_data(self):
         """Load the datasets"""
         print("[INFO] Loading datasets...")
         
-        # Load Salesforce data
         salesforce_path = os.path.join(BASE_DIR, "SalesforceOffice_synthetic_varied_100users_V1.csv")
-        if os.path.exists(salesforce_path):
-            try:
-                salesforce_df = load_csv(salesforce_path)
-                self.salesforce_agent = SalesforceAgent(salesforce_df)
-                print(f"[OK] Salesforce data loaded: {len(salesforce_df)} rows")
-            except Exception as e:
-                print(f"[ERROR] Failed to load Salesforce data: {e}")
-        
-        # Load Amadeus data
         amadeus_path = os.path.join(BASE_DIR, "amadeus-demo-full-no-fields.csv")
-        if os.path.exists(amadeus_path):
-            try:
-                amadeus_df = load_csv(amadeus_path)
-                self.amadeus_agent = AmadeusAgent(amadeus_df)
-                print(f"[OK] Amadeus data loaded: {len(amadeus_df)} rows")
-            except Exception as e:
-                print(f"[ERROR] Failed to load Amadeus data: {e}")
+        
+        # The two datasets are independent, so parse and summarize them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            salesforce_future = executor.submit(self._load_one, "Salesforce", salesforce_path, SalesforceAgent)
+            amadeus_future = executor.submit(self._load_one, "Amadeus", amadeus_path, AmadeusAgent)
+            salesforce_loaded = salesforce_future.result()
+            amadeus_loaded = amadeus_future.result()
+        
+        # Register results in a fixed order so the caches list salesforce first
+        for dataset_name, loaded in (("salesforce", salesforce_loaded), ("amadeus", amadeus_loaded)):
+            if loaded is None:
+                continue
+            agent, info, stats, signature = loaded
+            setattr(self, f"{dataset_name}_agent", agent)
+            self._info_cache[dataset_name] = info
+            self._stats_cache[dataset_name] = stats
+            self._source_signatures[dataset_name] = signature
     
-    def get_dataset_info(self, dataset_name):
-        """Get basic information about a dataset"""
-        if dataset_name == "salesforce" and self.salesforce_agent:
-            agent = self.salesforce_agent
-            df = agent.df
-        elif dataset_name == "amadeus" and self.amadeus_agent:
-            agent = self.amadeus_agent
-            df = agent.df
-        else:
+    def _load_one(self, label, path, agent_cls):
+        """
+        Load one dataset and compute its info and statistics
+        
+        Args:
+            label: Dataset name used in log messages
+            path: CSV file path
+            agent_cls: Agent class to wrap the DataFrame
+        
+        Returns:
+            (agent, info, stats, (file size, mtime_ns)) tuple, or None if the
+            file is missing or fails to load
+        """
+        try:
+            stat = os.stat(path)
+            df = load_csv_cached(path)
+            agent = agent_cls(df)
+            # Info describes the full file; the session only keeps the analyzed columns
+            info = self._compute_info(agent)
+            project_agent_frame(agent)
+            downcast_agent_frame(agent)
+            attach_column_arrays(agent)
+            stats = self._compute_stats(agent)
+            print(f"[OK] {label} data loaded: {len(df)} rows")
+            return agent, info, stats, (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            # Dataset not present in this installation
             return None
+        except Exception as e:
+            print(f"[ERROR] Failed to load {label} data: {e}")
+            return None
+    
+    def _compute_info(self, agent):
+        """Basic information about an agent's dataset"""
+        df = agent.df
         
         info = {
             "rows": len(df),
@@ -103,135 +449,354 @@ class DataChatBot:
         
         return info
     
+    def _compute_stats(self, agent):
+        """Summary statistics for an agent's dataset (independent of the question)"""
+        durations = agent.duration_vals
+        
+        # Every statistic works on the arrays attached at load time
+        user_activity = (_value_counts(agent.user_codes, agent.user_uniq)
+                         if agent.user_codes is not None else None)
+        activity_duration = (_group_mean(agent.activity_codes, agent.activity_uniq, durations)
+                             if agent.activity_codes is not None and durations is not None else None)
+        
+        # Basic statistics
+        stats = {
+            "total_rows": len(agent.df),
+            "unique_users": len(agent.user_uniq) if user_activity is not None else 0,
+            "unique_activities": len(agent.activity_uniq) if agent.activity_codes is not None else 0,
+            "avg_duration": np.nanmean(durations) if durations is not None else 0
+        }
+        
+        # Most active user
+        if user_activity is not None:
+            stats["most_active_user"] = user_activity.index[0] if len(user_activity) > 0 else None
+            stats["most_active_count"] = user_activity.iloc[0] if len(user_activity) > 0 else 0
+        
+        # Longest activities (partial top-k instead of sorting every activity)
+        if activity_duration is not None:
+            stats["longest_activities"] = activity_duration.nlargest(5).to_dict()
+        
+        # Team performance (if available)
+        if agent.team_codes is not None:
+            team_performance = _group_mean(agent.team_codes, agent.team_uniq, durations).sort_values(ascending=False)
+            stats["team_performance"] = team_performance.to_dict()
+        
+        # App usage (if available)
+        if agent.app_codes is not None:
+            app_usage = _value_counts(agent.app_codes, agent.app_uniq)
+            stats["app_usage"] = app_usage.head(10).to_dict()
+        
+        return stats
+    
+    def get_dataset_info(self, dataset_name):
+        """Get basic information about a dataset"""
+        return self._info_cache.get(dataset_name)
+    
     def analyze_data_for_question(self, question):
         """Analyze data to answer a specific question"""
-        results = {}
-        
-        # Analyze both datasets if available
-        for dataset_name, agent in [("salesforce", self.salesforce_agent), ("amadeus", self.amadeus_agent)]:
-            if agent is None:
-                continue
-            
-            df = agent.df
-            dataset_info = self.get_dataset_info(dataset_name)
-            
-            # Basic statistics
-            stats = {
-                "total_rows": len(df),
-                "unique_users": df[agent.user_col].nunique() if agent.user_col else 0,
-                "unique_activities": df[agent.activity_col].nunique() if agent.activity_col else 0,
-                "avg_duration": df[agent.duration_col].mean() if agent.duration_col else 0
-            }
-            
-            # Most active user
-            if agent.user_col:
-                user_activity = df[agent.user_col].value_counts()
-                stats["most_active_user"] = user_activity.index[0] if len(user_activity) > 0 else None
-                stats["most_active_count"] = user_activity.iloc[0] if len(user_activity) > 0 else 0
-            
-            # Longest activities
-            if agent.activity_col and agent.duration_col:
-                activity_duration = df.groupby(agent.activity_col)[agent.duration_col].mean().sort_values(ascending=False)
-                stats["longest_activities"] = activity_duration.head(5).to_dict()
-            
-            # Team performance (if available)
-            if hasattr(agent, 'team_col') and agent.team_col:
-                team_performance = df.groupby(agent.team_col)[agent.duration_col].mean().sort_values(ascending=False)
-                stats["team_performance"] = team_performance.to_dict()
-            
-            # App usage (if available)
-            if hasattr(agent, 'app_col') and agent.app_col:
-                app_usage = df[agent.app_col].value_counts()
-                stats["app_usage"] = app_usage.head(10).to_dict()
-            
-            results[dataset_name] = {
-                "info": dataset_info,
-                "stats": stats
+        # The statistics do not depend on the question, so serve the load-time results
+        return {
+            dataset_name: {
+                "info": self._info_cache[dataset_name],
+                "stats": self._stats_cache[dataset_name]
             }
+            for dataset_name in self._stats_cache
+        }
+    
+    def _dataset_fingerprint(self):
+        """Shape and source file of the loaded datasets; cached responses are only valid for the same data"""
+        fingerprint = []
+        for dataset_name in ("salesforce", "amadeus"):
+            info = self.get_dataset_info(dataset_name)
+            if info:
+                # Size and mtime catch edits that keep the row count and columns
+                fingerprint.append((dataset_name, info["rows"], tuple(info["columns"]),
+                                    self._source_signatures.get(dataset_name)))
+        return tuple(fingerprint)
+    
+    def _load_response_cache(self):
+        """Load persisted AI responses for the current datasets"""
+        try:
+            with open(LLM_CACHE_PATH, "rb") as f:
+                saved = pickle.load(f)
+            if saved.get("fingerprint") == self._dataset_fingerprint():
+                return saved["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable response cache: {e}")
+        return OrderedDict()
+    
+    def _save_response_cache(self):
+        """Persist cached AI responses so they survive restarts (registered with atexit)"""
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            entries = OrderedDict(self._response_cache)
+            self._cache_dirty = False
+        
+        # Pickle outside the lock into a temp file, then swap it in so a reader
+        # never sees a half-written cache
+        tmp_path = f"{LLM_CACHE_PATH}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"fingerprint": self._dataset_fingerprint(), "entries": entries}, f)
+            os.replace(tmp_path, LLM_CACHE_PATH)
+        except Exception as e:
+            print(f"[WARNING] Failed to save response cache: {e}")
+    
+    def _response_cache_key(self, question):
+        """Exact-match cache key for a question against the loaded datasets"""
+        normalized = " ".join(re.findall(r"\w+", question.lower()))
+        payload = f"{normalized}|{self._dataset_fingerprint()}"
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _warm_embeddings(self):
+        """Embed the sample and prefetch questions in a single batched request"""
+        questions = list(dict.fromkeys(SAMPLE_QUESTIONS + PREFETCH_QUESTIONS))
+        try:
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=questions)
+        except Exception:
+            return  # Questions are embedded on demand instead
+        
+        memo = {}
+        for question, item in zip(questions, response.data):
+            embedding = self._unit_vector(item.embedding)
+            if embedding is not None:
+                memo[self._response_cache_key(question)] = embedding
+        with self._cache_lock:
+            self._embedding_memo.update(memo)
+    
+    def _unit_vector(self, values):
+        """Normalize an embedding to unit length (None for a zero vector)"""
+        embedding = np.asarray(values, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+    
+    def _embed_question(self, question):
+        """Unit-length embedding of a question, or None if embeddings are unavailable"""
+        key = self._response_cache_key(question)
+        with self._cache_lock:
+            embedding = self._embedding_memo.get(key)
+        if embedding is not None:
+            return embedding
         
-        return results
+        try:
+            response = self.openai_client.embeddings.create(model=EMBEDDING_MODEL, input=question)
+        except Exception as e:
+            message = f"Embedding request failed, using exact-match cache only: {e}"
+            if threading.current_thread() is self._prefetch_thread:
+                logger.warning(message)
+            else:
+                print(f"[WARNING] {message}")
+            return None
+        
+        embedding = self._unit_vector(response.data[0].embedding)
+        if embedding is not None:
+            with self._cache_lock:
+                self._embedding_memo[key] = embedding
+        return embedding
+    
+    def _find_similar_response(self, embedding, key_terms):
+        """Cached response whose question embedding is closest, if above the threshold
+        and asked with the same key terms"""
+        with self._cache_lock:
+            entries = [(emb, text) for emb, terms, text in self._response_cache.values()
+                       if emb is not None and terms == key_terms]
+        if embedding is None or not entries:
+            return None
+        
+        # Embeddings are stored unit-length, so one matrix product gives cosine similarity
+        similarities = np.vstack([emb for emb, _ in entries]) @ embedding
+        best = int(similarities.argmax())
+        if similarities[best] >= SEMANTIC_CACHE_THRESHOLD:
+            return entries[best][1]
+        return None
+    
+    def _cache_response(self, key, embedding, key_terms, response_text):
+        """Store a response in the LRU cache (persisted at exit)"""
+        with self._cache_lock:
+            self._response_cache[key] = (embedding, key_terms, response_text)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > LLM_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+            self._cache_dirty = True
     
-    def get_ai_response(self, question, data_analysis):
-        """Get AI response based on question and data analysis"""
+    def get_ai_response(self, question, data_analysis, on_delta=None):
+        """
+        Get AI response based on question and data analysis
+        
+        Args:
+            question: User question
+            data_analysis: Output of analyze_data_for_question
+            on_delta: Optional callback; when given, the completion is streamed and
+                each text fragment is passed to it as it arrives
+        
+        Returns:
+            Full response text (cached and error responses are returned, not streamed)
+        """
         if not self.openai_client:
             return "AI features not available. Please check your OpenAI API key."
         
-        # Prepare context for AI
-        context = f"""
-        You are a task mining data analyst. Here's the data analysis for the question: "{question}"
+        # Exact hit on the normalized question
+        cache_key = self._response_cache_key(question)
+        with self._cache_lock:
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return cached[-1]
         
-        Data Analysis Results:
-        {data_analysis}
+        # Semantic hit on a near-identical question
+        embedding = self._embed_question(question)
+        key_terms = question_key_terms(question)
+        similar = self._find_similar_response(embedding, key_terms)
+        if similar is not None:
+            return similar
         
-        Please provide a clear, actionable answer to the user's question based on this data.
-        Include specific numbers, insights, and recommendations where relevant.
-        Be conversational and helpful.
-        """
+        # Prepare context for AI: role and instructions live in the system prompt,
+        # the user message carries only the question and compact JSON data
+        context = f"Question: {question}\nData: {compact_analysis(data_analysis)}"
         
         try:
             response = self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
-                    {"role": "system", "content": "You are an expert task mining analyst. Provide clear, data-driven insights."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": context}
                 ],
                 max_tokens=500,
-                temperature=0.7
+                temperature=0.7,
+                stream=on_delta is not None
             )
             
-            return response.choices[0].message.content
+            if on_delta is None:
+                answer = response.choices[0].message.content
+            else:
+                parts = []
+                for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        on_delta(delta)
+                        parts.append(delta)
+                answer = "".join(parts)
+            
+            self._cache_response(cache_key, embedding, key_terms, answer)
+            return answer
             
         except Exception as e:
             return f"Error getting AI response: {e}"
     
-    def answer_question(self, question):
-        """Answer a user question about the data"""
+    def answer_direct(self, question):
+        """
+        Answer simple statistic questions from the precomputed stats
+        
+        Args:
+            question: User question
+        
+        Returns:
+            Formatted answer per dataset, or None if the question needs the AI model
+        """
+        normalized = " ".join(re.findall(r"[\w@.-]+", question.lower().replace("'", ""))).strip(".")
+        
+        for pattern, formatter in DIRECT_INTENTS:
+            if not pattern.fullmatch(normalized):
+                continue
+            
+            lines = []
+            for dataset_name, stats in self._stats_cache.items():
+                answer = formatter(stats)
+                if answer is not None:
+                    lines.append(f"{dataset_name}: {answer}")
+            return "\n".join(lines) if lines else None
+        
+        return None
+    
+    def prefetch_followups(self):
+        """Answer likely follow-up questions in a background thread to fill the response cache"""
+        if not PREFETCH_ENABLED or not self.openai_client:
+            return
+        if self._prefetch_thread is not None and self._prefetch_thread.is_alive():
+            return
+        
+        with self._cache_lock:
+            pending = [
+                q for q in PREFETCH_QUESTIONS
+                if self.answer_direct(q) is None and self._response_cache_key(q) not in self._response_cache
+            ][:PREFETCH_COUNT]
+        if not pending:
+            return
+        
+        # Daemon thread so an in-flight prefetch never delays exiting the chat
+        self._prefetch_thread = threading.Thread(target=self._prefetch, args=(pending,), daemon=True)
+        self._prefetch_thread.start()
+    
+    def _prefetch(self, questions):
+        """Fill the response cache for questions; answers are discarded"""
+        try:
+            data_analysis = self.analyze_data_for_question(None)
+            for question in questions:
+                answer = self.get_ai_response(question, data_analysis)
+                if answer.startswith("Error getting AI response"):
+                    logger.warning("Prefetch of %r failed: %s", question, answer)
+        except Exception:
+            logger.exception("Prefetch failed")
+    
+    def answer_question(self, question, on_delta=None):
+        """Answer a user question about the data (streamed to on_delta if given)"""
         print(f"\n[ANALYZING] Question: {question}")
         
+        # Simple statistic lookups need no AI call
+        direct_answer = self.answer_direct(question)
+        if direct_answer is not None:
+            return direct_answer
+        
         # Analyze data
         data_analysis = self.analyze_data_for_question(question)
         
         # Get AI response
-        ai_response = self.get_ai_response(question, data_analysis)
+        ai_response = self.get_ai_response(question, data_analysis, on_delta=on_delta)
         
         return ai_response
     
     def show_available_datasets(self):
         """Show available datasets"""
-        print("\nAvailable datasets:")
+        lines = ["\nAvailable datasets:"]
         if self.salesforce_agent:
-            print(f"  - salesforce: {len(self.salesforce_agent.df)} rows")
+            lines.append(f"  - salesforce: {len(self.salesforce_agent.df)} rows")
         if self.amadeus_agent:
-            print(f"  - amadeus: {len(self.amadeus_agent.df)} rows")
+            lines.append(f"  - amadeus: {len(self.amadeus_agent.df)} rows")
+        print("\n".join(lines))
     
     def show_sample_questions(self):
         """Show sample questions users can ask"""
-        print("\nSample questions you can ask:")
-        print("  - Who is the most active user?")
-        print("  - What are the longest-running activities?")
-        print("  - Which team performs best?")
-        print("  - What applications are used most?")
-        print("  - What are the main bottlenecks?")
-        print("  - How many unique users do we have?")
-        print("  - What's the average task duration?")
-        print("  - Which activities take the longest time?")
-        print("  - Compare performance between teams")
-        print("  - What are the top 5 most common activities?")
+        print(SAMPLE_QUESTIONS_TEXT)
     
     def run_chat(self):
         """Run the interactive chat"""
-        print("\n" + "="*60)
-        print("🤖 Task Mining Data Chat Assistant")
-        print("="*60)
-        print("Ask me anything about your task mining data!")
-        print("Type 'help' for sample questions, 'datasets' for available data, or 'exit' to quit")
+        print("\n".join([
+            "\n" + "="*60,
+            "🤖 Task Mining Data Chat Assistant",
+            "="*60,
+            "Ask me anything about your task mining data!",
+            "Type 'help' for sample questions, 'datasets' for available data, or 'exit' to quit"
+        ]))
         
         self.show_available_datasets()
         self.show_sample_questions()
         
+        # Up-arrow recall of earlier questions (which then hit the response cache)
+        read_question = input
+        if PROMPT_TOOLKIT_AVAILABLE:
+            try:
+                read_question = PromptSession(history=FileHistory(CHAT_HISTORY_PATH)).prompt
+            except Exception as e:
+                print(f"[WARNING] Line editing unavailable, using plain input: {e}")
+        
         while True:
             try:
-                question = input("\n💬 Your question: ").strip()
+                question = read_question("\n💬 Your question: ").strip()
                 
                 if question.lower() in ['exit', 'quit', 'bye']:
                     print("\n👋 Goodbye! Thanks for using the Task Mining Chat Assistant!")
@@ -248,9 +813,24 @@ class DataChatBot:
                 if not question:
                     continue
                 
-                # Answer the question
-                answer = self.answer_question(question)
-                print(f"\n🤖 Assistant: {answer}")
+                # Answer the question, printing streamed text as it arrives
+                streamed = []
+                
+                def show_delta(delta):
+                    if not streamed:
+                        print("\n🤖 Assistant: ", end="", flush=True)
+                    streamed.append(delta)
+                    print(delta, end="", flush=True)
+                
+                answer = self.answer_question(question, on_delta=show_delta)
+                if streamed:
+                    print()
+                # Cached answers and errors are not streamed, so print them whole
+                if "".join(streamed) != answer:
+                    print(f"\n🤖 Assistant: {answer}")
+                
+                # Warm the cache for likely follow-ups while the user types
+                self.prefetch_followups()
                 
             except KeyboardInterrupt:
                 print("\n\n👋 Goodbye! Thanks for using the Task Mining Chat Assistant!")
@@ -264,8 +844,9 @@ def main():
     print("="*40)
     
     # Check if data files exist
-    data_dir = Path("Data Sources")
-    if not data_dir.exists():
+    try:
+        next(Path("Data Sources").iterdir(), None)
+    except (FileNotFoundError, NotADirectoryError):
         print("[ERROR] Data Sources directory not found")
         return False
     
@@ -10,62 +10,375 @@ import gradio as gr
 import os
 import json
 import tempfile
+import html
+import urllib.parse
+import queue
+import threading
+import time
+import itertools
 from datetime import datetime
-from pathlib import Path
 import pandas as pd
-import altair as alt
 
 # Import the main system components
 from main import (
-    load_csv, find_column, save_chart, fmt,
-    SalesforceAgent, AmadeusAgent, CreativeDataChatBot, CreativeOrchestrator
+    load_csv, normalize_column, find_column, save_chart,
+    SalesforceAgent, AmadeusAgent, CreativeOrchestrator
 )
 
+# Parquet copies of the source CSVs load much faster than re-parsing the text
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: orjson serializes the chat export several times faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 BASE_DIR = r"C:\Users\claud\OneDrive\Desktop\ESADE\Masters in Busienss Analytics\Apromore In-company project\Apromore Chatbot\Data Sources"
 SALESFORCE_FILE = "SalesforceOffice_synthetic_varied_100users_V1_with_teams.csv"
 AMADEUS_FILE = "amadeus-demo-full-no-fields.csv"
 CHARTS_DIR = os.path.join(BASE_DIR, "charts")
 os.makedirs(CHARTS_DIR, exist_ok=True)
+# Route Gradio serves allowed_paths files from; Gradio 5 moved it under /gradio_api
+try:
+    GRADIO_MAJOR_VERSION = int(str(gr.__version__).split(".")[0])
+except (AttributeError, ValueError):
+    GRADIO_MAJOR_VERSION = 4
+GRADIO_FILE_ROUTE = "/gradio_api/file=" if GRADIO_MAJOR_VERSION >= 5 else "/file="
+# Pickled frames (as prepared by the agents) reused across restarts;
+# bump CACHE_VERSION when the loading or agent preprocessing changes
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+CACHE_VERSION = 3
 
-# Global variables to store system state
+# Shared system state; the agents are read-only once loaded and each browser
+# session keeps its own active dataset in a gr.State (see new_session)
 orchestrator = None
-chat_history = []
+datasets_loaded = False
 
-def initialize_system():
-    """Initialize the task mining system"""
-    global orchestrator
+# Agent columns holding repeated labels; stored as categoricals for smaller
+# frames and faster groupby/value_counts
+CATEGORY_ATTRS = ("user_col", "team_col", "activity_col", "app_col", "process_col")
+
+# Chart Gallery chart types -> agent method; some analyses only exist for Salesforce
+CHART_METHODS = {
+    "Summary": "summary",
+    "Bottlenecks": "top_bottlenecks",
+    "Team Performance": "team_performance",
+    "App Usage": "app_usage",
+}
+SALESFORCE_ONLY_CHARTS = {"Team Performance", "App Usage"}
+
+# Sequence number appended to chart file names
+_CHART_SEQ = itertools.count()
+
+# Parsed datasets keyed by (path, modification time); a refresh reuses them
+# unless the file on disk has changed
+_DF_CACHE = {}
+
+# Agent analysis results keyed by (dataset, method); cleared when the system is (re)initialized
+_RESULT_CACHE = {}
+
+# Analysis Dashboard reports keyed by dataset label, built when the system is initialized
+_ANALYSIS_CACHE = {}
+
+def _ensure_parquet(csv_path):
+    """
+    Make sure a Parquet copy of a source CSV exists next to it
+    
+    The copy is (re)written from load_csv whenever it is missing or older
+    than the CSV, so it always holds the same normalized columns.
     
+    Args:
+        csv_path: Path to the source CSV file
+    
+    Returns:
+        Path to the Parquet file, or None if pyarrow is unavailable or the
+        copy could not be written
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
     try:
-        # Load data
-        salesforce_path = os.path.join(BASE_DIR, SALESFORCE_FILE)
-        amadeus_path = os.path.join(BASE_DIR, AMADEUS_FILE)
-        
-        if not os.path.exists(salesforce_path) or not os.path.exists(amadeus_path):
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path):
+            return parquet_path
+    except OSError:
+        pass
+    
+    try:
+        load_csv(csv_path).to_parquet(parquet_path, engine="pyarrow", compression="zstd")
+        return parquet_path
+    except Exception as e:
+        print(f"[WARNING] Could not write Parquet copy of {csv_path}: {e}")
+        return None
+
+def dataset_columns(csv_path, agent_cls):
+    """Columns of a source CSV that agent_cls reads, resolved from the header alone"""
+    header = pd.read_csv(csv_path, nrows=0)
+    header.columns = [normalize_column(c) for c in header.columns]
+    return agent_cls.required_columns(header)
+
+def load_dataset(csv_path, columns=None):
+    """
+    Load a source dataset, from its Parquet copy when available, else from the CSV
+    
+    Args:
+        csv_path: Path to the source CSV file
+        columns: Normalized column names to read (all columns when None)
+    
+    Returns:
+        DataFrame with normalized column names
+    """
+    parquet_path = _ensure_parquet(csv_path)
+    if parquet_path:
+        return pd.read_parquet(parquet_path, engine="pyarrow", columns=columns)
+    return load_csv(csv_path, columns)
+
+def _categorize(df, agent_cls):
+    """Convert agent_cls's label columns of df to the category dtype in place"""
+    for attr in CATEGORY_ATTRS:
+        candidates = agent_cls.COLUMN_CANDIDATES.get(attr)
+        col = find_column(df, candidates) if candidates else None
+        if col and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].astype("category")
+
+def _pickle_path(csv_path):
+    """Location of the pickled frame for a source CSV"""
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.v{CACHE_VERSION}.pkl")
+
+def _pickle_is_fresh(csv_path):
+    """True if the pickled frame exists and is newer than its CSV"""
+    try:
+        return os.path.getmtime(_pickle_path(csv_path)) >= os.path.getmtime(csv_path)
+    except OSError:
+        return False
+
+def _save_pickled(csv_path, df):
+    """Persist a prepared frame so the next start skips parsing (best effort)"""
+    if _pickle_is_fresh(csv_path):
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_pickle(_pickle_path(csv_path))
+    except Exception as e:
+        print(f"[WARNING] Could not cache {csv_path}: {e}")
+
+def _cached_load(path, agent_cls):
+    """load_dataset of agent_cls's columns, reusing a frame parsed earlier in this process or pickled by a previous run"""
+    key = (path, os.path.getmtime(path))
+    df = _DF_CACHE.get(key)
+    if df is None:
+        # Drop frames parsed from an older version of the same file
+        for stale_key in [k for k in _DF_CACHE if k[0] == path]:
+            del _DF_CACHE[stale_key]
+        df = None
+        if _pickle_is_fresh(path):
+            try:
+                df = pd.read_pickle(_pickle_path(path))
+            except Exception as e:
+                print(f"[WARNING] Ignoring unreadable cache for {path}: {e}")
+        if df is None:
+            df = load_dataset(path, dataset_columns(path, agent_cls))
+            _categorize(df, agent_cls)
+        _DF_CACHE[key] = df
+    return df
+
+def _chart_id():
+    """Unique suffix for a chart file name (two charts in the same second no longer collide)"""
+    return f"{int(time.time())}_{next(_CHART_SEQ)}"
+
+def _strip_desc(chart):
+    """
+    Chart with Vega-Lite's ARIA output turned off
+    
+    By default Vega-Lite attaches a generated description (and ARIA role
+    description) to every mark; it has no visual effect but slows rendering
+    of charts with many marks.
+    
+    Args:
+        chart: Top-level Altair chart from an agent result
+    
+    Returns:
+        Configured copy of the chart (the chart itself if it cannot be configured)
+    """
+    try:
+        return chart.configure(aria=False)
+    except Exception:
+        return chart
+
+def _chart_iframe(chart_path):
+    """
+    Embed a saved chart by URL so the browser fetches the file itself
+    
+    The HTML file is served by Gradio from CHARTS_DIR (see allowed_paths in
+    demo.launch) instead of being read into Python and sent inline. The URL
+    uses the file route of the installed Gradio version.
+    
+    Args:
+        chart_path: Path of the chart HTML written by save_chart
+    
+    Returns:
+        iframe markup for a gr.HTML component
+    """
+    src = html.escape(GRADIO_FILE_ROUTE + urllib.parse.quote(chart_path))
+    return f'<iframe src="{src}" width="100%" height="500" frameborder="0"></iframe>'
+
+def _agent_result(dataset, method):
+    """
+    Result of an agent analysis method, computed once per dataset
+    
+    Args:
+        dataset: Dataset key ("salesforce" or "amadeus")
+        method: Agent method name (e.g. "summary", "top_bottlenecks")
+    
+    Returns:
+        The method's result dict
+    """
+    key = (dataset, method)
+    result = _RESULT_CACHE.get(key)
+    if result is None:
+        result = _RESULT_CACHE[key] = getattr(orchestrator.agents[dataset], method)()
+    return result
+
+def _precompute_analysis(dataset):
+    """
+    Build the Analysis Dashboard report for a dataset and cache it
+    
+    Args:
+        dataset: Dataset label as shown in the UI ("Salesforce" or "Amadeus")
+    
+    Returns:
+        The report text
+    """
+    agent_key = "salesforce" if dataset == "Salesforce" else "amadeus"
+    separator = "\n" + "="*50 + "\n"
+    
+    results = [f"=== {dataset} Dataset Analysis ===\n"]
+    
+    results.append("📊 SUMMARY:")
+    results.append(_agent_result(agent_key, "summary").get("text", "No summary available"))
+    results.append(separator)
+    
+    results.append("🚧 BOTTLENECKS ANALYSIS:")
+    results.append(_agent_result(agent_key, "top_bottlenecks").get("text", "No bottlenecks analysis available"))
+    results.append(separator)
+    
+    # Team Performance (Salesforce only)
+    if dataset == "Salesforce":
+        results.append("👥 TEAM PERFORMANCE:")
+        results.append(_agent_result(agent_key, "team_performance").get("text", "No team performance analysis available"))
+        results.append(separator)
+    
+    results.append("💡 RECOMMENDATIONS:")
+    results.append(_agent_result(agent_key, "recommendations").get("text", "No recommendations available"))
+    
+    report = _ANALYSIS_CACHE[dataset] = "\n".join(results)
+    return report
+
+def _run_agent_action(dataset, method, chart_prefix):
+    """
+    Run an agent analysis for a dataset and save its chart, if it has one
+    
+    Args:
+        dataset: Dataset label as shown in the UI ("Salesforce" or "Amadeus")
+        method: Agent method name (e.g. "top_bottlenecks")
+        chart_prefix: File name prefix for the saved chart
+    
+    Returns:
+        (result dict, save_chart paths dict or None)
+    """
+    result = _agent_result("salesforce" if dataset == "Salesforce" else "amadeus", method)
+    chart_paths = None
+    if "chart" in result:
+        chart_name = f"{chart_prefix}_{dataset.lower()}_{_chart_id()}"
+        chart_paths = save_chart(_strip_desc(result["chart"]), chart_name)
+    return result, chart_paths
+
+def _check_data_files():
+    """
+    Check that both source files are present, without loading them
+    
+    Returns:
+        (success, message) tuple
+    """
+    sizes = []
+    for label, file_name in (("Salesforce", SALESFORCE_FILE), ("Amadeus", AMADEUS_FILE)):
+        path = os.path.join(BASE_DIR, file_name)
+        if not os.path.exists(path):
             return False, "Data files not found. Please ensure CSV files are in the Data Sources folder."
+        sizes.append(f"{label} {os.path.getsize(path) / 1e6:.1f} MB")
+    return True, f"Data files found ({', '.join(sizes)})"
+
+def _load_datasets():
+    """Load both datasets and build the agents, orchestrator and cached analyses"""
+    global orchestrator, datasets_loaded
+    
+    salesforce_path = os.path.join(BASE_DIR, SALESFORCE_FILE)
+    amadeus_path = os.path.join(BASE_DIR, AMADEUS_FILE)
+    
+    salesforce_df = _cached_load(salesforce_path, SalesforceAgent)
+    amadeus_df = _cached_load(amadeus_path, AmadeusAgent)
+    
+    # Create agents
+    agents = {
+        "salesforce": SalesforceAgent(salesforce_df),
+        "amadeus": AmadeusAgent(amadeus_df),
+    }
+    
+    # Cache the frames after the agents have prepared them (numeric durations)
+    _save_pickled(salesforce_path, salesforce_df)
+    _save_pickled(amadeus_path, amadeus_df)
+    
+    # Create orchestrator
+    orchestrator = CreativeOrchestrator(agents)
+    _RESULT_CACHE.clear()
+    orchestrator.active = "salesforce"  # Default to salesforce
+    orchestrator.chatbot.current_dataset = "salesforce"
+    
+    # Dashboard reports are served from memory; a failure here is reported on click instead
+    _ANALYSIS_CACHE.clear()
+    for dataset in ("Salesforce", "Amadeus"):
+        try:
+            _precompute_analysis(dataset)
+        except Exception as e:
+            print(f"[WARNING] Could not precompute {dataset} analysis: {e}")
+    
+    datasets_loaded = True
+
+def initialize_system():
+    """Initialize the task mining system"""
+    try:
+        success, message = _check_data_files()
+        if not success:
+            return False, message
         
-        salesforce_df = load_csv(salesforce_path)
-        amadeus_df = load_csv(amadeus_path)
-        
-        # Create agents
-        agents = {
-            "salesforce": SalesforceAgent(salesforce_df),
-            "amadeus": AmadeusAgent(amadeus_df),
-        }
-        
-        # Create orchestrator
-        orchestrator = CreativeOrchestrator(agents)
-        orchestrator.active = "salesforce"  # Default to salesforce
-        orchestrator.chatbot.current_dataset = "salesforce"
-        
+        _load_datasets()
         return True, "System initialized successfully!"
         
     except Exception as e:
         return False, f"Error initializing system: {str(e)}"
 
-def handle_chat(message, history):
-    """Handle chat messages"""
-    global orchestrator, chat_history
+def new_session():
+    """Initial per-session state: the dataset the session's chat is routed to"""
+    return {"active": "salesforce"}
+
+def _session_orchestrator(session):
+    """Orchestrator over the shared agents, pointed at the session's active dataset"""
+    routed = CreativeOrchestrator(orchestrator.agents)
+    routed.active = session["active"]
+    routed.chatbot.current_dataset = session["active"]
+    return routed
+
+def handle_chat(message, history, session, on_delta=None):
+    """Handle chat messages (AI chat text is streamed to on_delta if given)"""
+    global orchestrator
     
     if orchestrator is None:
         return history, "System not initialized. Please refresh the page.", None, None
@@ -77,9 +390,14 @@ def handle_chat(message, history):
         # Add user message to history
         history.append([message, None])
         
-        # Process the message
-        result = orchestrator.route(message)
+        # Process the message; 'switch' commands only change this session's dataset
+        routed = _session_orchestrator(session)
+        result = routed.route(message, on_delta)
         response = result.get("text", "No response generated.")
+        if routed.active != session["active"]:
+            session["active"] = routed.active
+        elif routed.chatbot.current_dataset != session["active"]:
+            session["active"] = routed.chatbot.current_dataset
         
         # Add AI response to history
         history[-1][1] = response
@@ -90,13 +408,10 @@ def handle_chat(message, history):
         
         if "chart" in result:
             # Generate a temporary chart file
-            chart_name = f"gradio_chart_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            chart_paths = save_chart(result["chart"], chart_name)
+            chart_name = f"gradio_chart_{_chart_id()}"
+            # save_chart hands back the Vega-Lite spec it wrote, no need to read it again
+            chart_paths, chart_json = save_chart(_strip_desc(result["chart"]), chart_name, return_spec=True)
             chart_path = chart_paths["html"]
-            
-            # Also get the Vega-Lite JSON
-            with open(chart_paths["vegalite"], 'r', encoding='utf-8') as f:
-                chart_json = json.load(f)
         
         return history, response, chart_path, chart_json
         
@@ -105,8 +420,8 @@ def handle_chat(message, history):
         history.append([message, error_msg])
         return history, error_msg, None, None
 
-def switch_dataset(dataset):
-    """Switch between datasets"""
+def switch_dataset(dataset, session):
+    """Switch the session between datasets"""
     global orchestrator
     
     if orchestrator is None:
@@ -114,17 +429,15 @@ def switch_dataset(dataset):
     
     try:
         if dataset == "Salesforce":
-            orchestrator.active = "salesforce"
-            orchestrator.chatbot.current_dataset = "salesforce"
+            session["active"] = "salesforce"
             return f"Switched to Salesforce dataset", "salesforce"
         else:
-            orchestrator.active = "amadeus"
-            orchestrator.chatbot.current_dataset = "amadeus"
+            session["active"] = "amadeus"
             return f"Switched to Amadeus dataset", "amadeus"
     except Exception as e:
         return f"Error switching dataset: {str(e)}", None
 
-def export_chat_history(history):
+def export_chat_history(history, session):
     """Export chat history to JSON"""
     if not history:
         return None, "No chat history to export"
@@ -133,7 +446,7 @@ def export_chat_history(history):
         # Create export data
         export_data = {
             "timestamp": datetime.now().isoformat(),
-            "dataset": orchestrator.active if orchestrator else "unknown",
+            "dataset": session["active"] if orchestrator else "unknown",
             "chat_history": history,
             "system_info": {
                 "version": "1.0",
@@ -141,9 +454,13 @@ def export_chat_history(history):
             }
         }
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        # Serialize in one go and save to temporary file with a single write
+        if ORJSON_AVAILABLE:
+            payload = orjson.dumps(export_data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(export_data, indent=2, ensure_ascii=False).encode('utf-8')
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+            f.write(payload)
             temp_path = f.name
         
         return temp_path, "Chat history exported successfully!"
@@ -160,9 +477,9 @@ def get_dataset_summary(dataset):
     
     try:
         if dataset == "Salesforce":
-            result = orchestrator.agents["salesforce"].summary()
+            result = _agent_result("salesforce", "summary")
         else:
-            result = orchestrator.agents["amadeus"].summary()
+            result = _agent_result("amadeus", "summary")
         
         return result.get("text", "No summary available")
         
@@ -177,21 +494,9 @@ def get_bottlenecks(dataset):
         return "System not initialized", None
     
     try:
-        if dataset == "Salesforce":
-            result = orchestrator.agents["salesforce"].top_bottlenecks()
-        else:
-            result = orchestrator.agents["amadeus"].top_bottlenecks()
-        
+        result, chart_paths = _run_agent_action(dataset, "top_bottlenecks", "bottlenecks")
         text = result.get("text", "No bottlenecks analysis available")
-        
-        # Generate chart if available
-        chart_path = None
-        if "chart" in result:
-            chart_name = f"bottlenecks_{dataset.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            chart_paths = save_chart(result["chart"], chart_name)
-            chart_path = chart_paths["html"]
-        
-        return text, chart_path
+        return text, chart_paths and chart_paths["html"]
         
     except Exception as e:
         return f"Error getting bottlenecks: {str(e)}", None
@@ -204,21 +509,12 @@ def get_team_performance(dataset):
         return "System not initialized", None
     
     try:
-        if dataset == "Salesforce":
-            result = orchestrator.agents["salesforce"].team_performance()
-        else:
+        if dataset != "Salesforce":
             return "Team performance analysis not available for Amadeus dataset", None
         
+        result, chart_paths = _run_agent_action(dataset, "team_performance", "team_performance")
         text = result.get("text", "No team performance analysis available")
-        
-        # Generate chart if available
-        chart_path = None
-        if "chart" in result:
-            chart_name = f"team_performance_{dataset.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            chart_paths = save_chart(result["chart"], chart_name)
-            chart_path = chart_paths["html"]
-        
-        return text, chart_path
+        return text, chart_paths and chart_paths["html"]
         
     except Exception as e:
         return f"Error getting team performance: {str(e)}", None
@@ -232,9 +528,9 @@ def get_recommendations(dataset):
     
     try:
         if dataset == "Salesforce":
-            result = orchestrator.agents["salesforce"].recommendations()
+            result = _agent_result("salesforce", "recommendations")
         else:
-            result = orchestrator.agents["amadeus"].recommendations()
+            result = _agent_result("amadeus", "recommendations")
         
         return result.get("text", "No recommendations available")
         
@@ -261,6 +557,9 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
     **Status:** """ + ("✅ System Ready" if init_success else f"❌ {init_message}")
     )
     
+    # Per-browser-session state (the active dataset)
+    session = gr.State(new_session)
+    
     with gr.Tab("💬 AI Chat Interface"):
         with gr.Row():
             with gr.Column(scale=3):
@@ -310,44 +609,64 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
         def user(user_message, history):
             return "", history + [[user_message, None]]
         
-        def bot(history):
+        def bot(history, session):
             user_message = history[-1][0]
-            history, response, chart_path, chart_json = handle_chat(user_message, history)
-            return history, response, chart_path
+            shown = [list(turn) for turn in history]
+            
+            # Answer on a worker thread and show the AI text as it streams in
+            deltas = queue.Queue()
+            outcome = {}
+            
+            def answer():
+                try:
+                    outcome["result"] = handle_chat(user_message, history, session, on_delta=deltas.put)
+                finally:
+                    deltas.put(None)
+            
+            threading.Thread(target=answer, daemon=True).start()
+            
+            streamed = ""
+            while True:
+                delta = deltas.get()
+                if delta is None:
+                    break
+                streamed += delta
+                partial = f"🤖 {streamed}"
+                yield shown + [[user_message, partial]], partial, None, session
+            
+            history, response, chart_path, chart_json = outcome["result"]
+            yield history, response, chart_path and _chart_iframe(chart_path), session
         
         msg.submit(user, [msg, chatbot], [msg, chatbot], queue=False).then(
-            bot, chatbot, [chatbot, msg, chart_display]
+            bot, [chatbot, session], [chatbot, msg, chart_display, session]
         )
         send_btn.click(user, [msg, chatbot], [msg, chatbot], queue=False).then(
-            bot, chatbot, [chatbot, msg, chart_display]
+            bot, [chatbot, session], [chatbot, msg, chart_display, session]
         )
         
         # Dataset switching
-        def switch_and_update(dataset):
-            status, active = switch_dataset(dataset)
-            return status, active
-        
-        dataset_selector.change(switch_and_update, dataset_selector, [gr.Textbox(visible=False), gr.Textbox(visible=False)])
+        def switch_and_update(dataset, session):
+            status, active = switch_dataset(dataset, session)
+            return status, active, session
+        
+        dataset_selector.change(
+            switch_and_update,
+            [dataset_selector, session],
+            [gr.Textbox(visible=False), gr.Textbox(visible=False), session]
+        )
         
         # Quick action handlers
         def handle_summary(dataset):
             return get_dataset_summary(dataset)
         
+        def _with_chart_frame(text, chart_path):
+            return text, _chart_iframe(chart_path) if chart_path else None
+        
         def handle_bottlenecks(dataset):
-            text, chart_path = get_bottlenecks(dataset)
-            if chart_path:
-                with open(chart_path, 'r', encoding='utf-8') as f:
-                    chart_html = f.read()
-                return text, chart_html
-            return text, None
+            return _with_chart_frame(*get_bottlenecks(dataset))
         
         def handle_team_performance(dataset):
-            text, chart_path = get_team_performance(dataset)
-            if chart_path:
-                with open(chart_path, 'r', encoding='utf-8') as f:
-                    chart_html = f.read()
-                return text, chart_html
-            return text, None
+            return _with_chart_frame(*get_team_performance(dataset))
         
         def handle_recommendations(dataset):
             return get_recommendations(dataset)
@@ -356,7 +675,8 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
         summary_btn.click(
             handle_summary, 
             dataset_selector, 
-            gr.Textbox(label="Summary Results", lines=10)
+            gr.Textbox(label="Summary Results", lines=10),
+            concurrency_limit=8  # read-only lookup of cached agent results
         )
         
         bottlenecks_btn.click(
@@ -374,19 +694,21 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
         recommendations_btn.click(
             handle_recommendations,
             dataset_selector,
-            gr.Textbox(label="Recommendations", lines=10)
+            gr.Textbox(label="Recommendations", lines=10),
+            concurrency_limit=8  # read-only lookup of cached agent results
         )
         
         # Export chat history
-        def export_chat():
-            if chatbot.value:
-                file_path, status = export_chat_history(chatbot.value)
+        def export_chat(history, session):
+            if history:
+                file_path, status = export_chat_history(history, session)
                 return file_path, status
             return None, "No chat history to export"
         
         export_chat_btn.click(
             export_chat,
-            outputs=[gr.File(label="Download Chat History"), export_status]
+            [chatbot, session],
+            [gr.File(label="Download Chat History"), export_status]
         )
     
     with gr.Tab("📊 Analysis Dashboard"):
@@ -417,46 +739,11 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
                 return "System not initialized"
             
             try:
-                results = []
-                results.append(f"=== {dataset} Dataset Analysis ===\n")
-                
-                # Summary
-                if dataset == "Salesforce":
-                    summary_result = orchestrator.agents["salesforce"].summary()
-                else:
-                    summary_result = orchestrator.agents["amadeus"].summary()
-                
-                results.append("📊 SUMMARY:")
-                results.append(summary_result.get("text", "No summary available"))
-                results.append("\n" + "="*50 + "\n")
-                
-                # Bottlenecks
-                if dataset == "Salesforce":
-                    bottlenecks_result = orchestrator.agents["salesforce"].top_bottlenecks()
-                else:
-                    bottlenecks_result = orchestrator.agents["amadeus"].top_bottlenecks()
-                
-                results.append("🚧 BOTTLENECKS ANALYSIS:")
-                results.append(bottlenecks_result.get("text", "No bottlenecks analysis available"))
-                results.append("\n" + "="*50 + "\n")
-                
-                # Team Performance (Salesforce only)
-                if dataset == "Salesforce":
-                    team_result = orchestrator.agents["salesforce"].team_performance()
-                    results.append("👥 TEAM PERFORMANCE:")
-                    results.append(team_result.get("text", "No team performance analysis available"))
-                    results.append("\n" + "="*50 + "\n")
-                
-                # Recommendations
-                if dataset == "Salesforce":
-                    rec_result = orchestrator.agents["salesforce"].recommendations()
-                else:
-                    rec_result = orchestrator.agents["amadeus"].recommendations()
-                
-                results.append("💡 RECOMMENDATIONS:")
-                results.append(rec_result.get("text", "No recommendations available"))
-                
-                return "\n".join(results)
+                # Built when the system was initialized; rebuilt only if that failed
+                report = _ANALYSIS_CACHE.get(dataset)
+                if report is None:
+                    report = _precompute_analysis(dataset)
+                return report
                 
             except Exception as e:
                 return f"Error running analysis: {str(e)}"
@@ -498,35 +785,16 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
                 return "System not initialized", None
             
             try:
-                if dataset == "Salesforce":
-                    agent = orchestrator.agents["salesforce"]
-                else:
-                    agent = orchestrator.agents["amadeus"]
-                
                 # Get the appropriate chart
-                if chart_type == "Summary":
-                    result = agent.summary()
-                elif chart_type == "Bottlenecks":
-                    result = agent.top_bottlenecks()
-                elif chart_type == "Team Performance" and dataset == "Salesforce":
-                    result = agent.team_performance()
-                elif chart_type == "App Usage" and dataset == "Salesforce":
-                    result = agent.app_usage()
-                else:
+                method = CHART_METHODS.get(chart_type)
+                if method is None or (chart_type in SALESFORCE_ONLY_CHARTS and dataset != "Salesforce"):
                     return f"Chart type '{chart_type}' not available for {dataset} dataset", None
                 
-                if "chart" not in result:
+                result, chart_paths = _run_agent_action(dataset, method, chart_type.lower().replace(' ', '_'))
+                if chart_paths is None:
                     return "No chart available for this analysis", None
                 
-                # Generate chart
-                chart_name = f"{chart_type.lower().replace(' ', '_')}_{dataset.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                chart_paths = save_chart(result["chart"], chart_name)
-                
-                # Read and return chart HTML
-                with open(chart_paths["html"], 'r', encoding='utf-8') as f:
-                    chart_html = f.read()
-                
-                return chart_html, chart_paths["html"]
+                return _chart_iframe(chart_paths["html"]), chart_paths["html"]
                 
             except Exception as e:
                 return f"Error generating chart: {str(e)}", None
@@ -534,7 +802,8 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
         generate_chart_btn.click(
             generate_chart,
             [chart_dataset, chart_type],
-            [chart_output, chart_download]
+            [chart_output, chart_download],
+            concurrency_limit=2  # chart export is disk-bound
         )
     
     with gr.Tab("⚙️ System Info"):
@@ -564,18 +833,27 @@ with gr.Blocks(title="Task Mining AI Chat System", theme=gr.themes.Soft()) as de
             
             with gr.Column():
                 refresh_btn = gr.Button("🔄 Refresh System", variant="secondary")
+                force_reload = gr.Checkbox(label="Force reload", value=False,
+                                           info="Reload the datasets instead of only checking the data files")
                 system_status = gr.Textbox(
                     label="System Status",
                     value=init_message,
                     interactive=False
                 )
         
-        def refresh_system():
-            """Refresh the system"""
-            success, message = initialize_system()
+        def refresh_system(reload):
+            """Refresh the system status (reloading the datasets only when asked or not yet loaded)"""
+            if reload or not datasets_loaded:
+                success, message = initialize_system()
+            else:
+                success, message = _check_data_files()
             return f"System refresh: {message}"
         
-        refresh_btn.click(refresh_system, outputs=system_status)
+        refresh_btn.click(refresh_system, force_reload, system_status)
+
+# Let independent requests from different users run in parallel (per-event
+# limits above override this default)
+demo.queue(default_concurrency_limit=4)
 
 # Launch the interface
 if __name__ == "__main__":
@@ -584,5 +862,6 @@ if __name__ == "__main__":
         server_port=7860,
         share=False,
         show_error=True,
+        allowed_paths=[CHARTS_DIR],  # chart iframes load their HTML from here
         quiet=False
     )
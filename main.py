@@ -19,7 +19,9 @@ Usage:
 """
 
 import os
+import copy
 import json
+import asyncio
 import textwrap
 from datetime import datetime
 from typing import Dict, Any, Optional, List
@@ -30,7 +32,7 @@ import altair as alt
 
 # Try to import OpenAI with new API
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     from dotenv import load_dotenv
     load_dotenv()
     
@@ -41,6 +43,21 @@ except ImportError:
     OPENAI_AVAILABLE = False
     print("[WARNING] OpenAI not available. Chat features will be limited.")
 
+# Sampling settings for the creative AI chat
+CHAT_COMPLETION_PARAMS = {
+    "model": "gpt-3.5-turbo",
+    "max_tokens": 600,  # Increased for more detailed responses
+    "temperature": 0.8,  # Higher temperature for more creative responses
+    "top_p": 0.9,  # Higher top_p for more diverse responses
+    "presence_penalty": 0.1,  # Slight penalty to avoid repetition
+    "frequency_penalty": 0.1,  # Slight penalty to encourage variety
+}
+
+# Batched AI chat (chat_with_ai_many): requests in flight at once, and retries
+# the OpenAI SDK makes (with exponential backoff) on rate limits and timeouts
+OPENAI_MAX_CONCURRENT = int(os.getenv('OPENAI_MAX_CONCURRENT', '10'))
+OPENAI_MAX_RETRIES = 6
+
 # Try to import comprehensive analytics
 try:
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
@@ -66,9 +83,15 @@ os.makedirs(CHARTS_DIR, exist_ok=True)
 # -------------------------------
 # Utilities
 # -------------------------------
-def load_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    df.columns = [c.strip().replace(" ", "_") for c in df.columns]
+def normalize_column(name: str) -> str:
+    return name.strip().replace(" ", "_")
+
+def load_csv(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    # columns: normalized names to keep; None reads every column
+    keep = None if columns is None else set(columns)
+    usecols = None if keep is None else (lambda c: normalize_column(c) in keep)
+    df = pd.read_csv(path, usecols=usecols)
+    df.columns = [normalize_column(c) for c in df.columns]
     return df
 
 def find_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
@@ -82,15 +105,21 @@ def find_column(df: pd.DataFrame, candidates: List[str]) -> Optional[str]:
             return c
     return None
 
-def save_chart(chart: alt.Chart, name: str) -> Dict[str, str]:
+def save_chart(chart: alt.Chart, name: str, return_spec: bool = False):
+    # With return_spec=True, also returns the Vega-Lite dict that was written
     base = os.path.join(CHARTS_DIR, name)
     html_path = f"{base}.html"
     vl_path = f"{base}.vl.json"
     chart.save(html_path)
     chart_json = chart.to_dict()
-    with open(vl_path, "w", encoding="utf-8") as f:
-        json.dump(chart_json, f, ensure_ascii=False, indent=2)
-    return {"html": html_path, "vegalite": vl_path}
+    # Serialize up front and write once (json.dump issues a write per token)
+    payload = json.dumps(chart_json, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(vl_path, "wb") as f:
+        f.write(payload)
+    paths = {"html": html_path, "vegalite": vl_path}
+    if return_spec:
+        return paths, chart_json
+    return paths
 
 def fmt(msg: str) -> str:
     return textwrap.fill(msg, width=100)
@@ -159,6 +188,14 @@ class CreativeDataChatBot:
             
         df = agent.df
         
+        # The frames do not change once loaded, so each summary is built once.
+        # The memo lives on the agent, which outlives the per-message chatbots,
+        # and callers get a copy so they can annotate it freely.
+        cache_key = (dataset_name, id(df), len(df))
+        cached = agent.summary_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
         summary = {
             "dataset": dataset_name,
             "rows": len(df),
@@ -170,8 +207,8 @@ class CreativeDataChatBot:
         # Add specific insights
         if hasattr(agent, 'user_col') and agent.user_col:
             summary["unique_users"] = df[agent.user_col].nunique()
-            summary["most_active_user"] = df[agent.user_col].value_counts().index[0]
-            summary["user_activity_counts"] = df[agent.user_col].value_counts().head(5).to_dict()
+            summary["most_active_user"] = agent.column_counts(agent.user_col).index[0]
+            summary["user_activity_counts"] = agent.column_counts(agent.user_col).head(5).to_dict()
             
         if hasattr(agent, 'duration_col') and agent.duration_col:
             summary["avg_duration"] = df[agent.duration_col].mean()
@@ -180,14 +217,15 @@ class CreativeDataChatBot:
             
         if hasattr(agent, 'activity_col') and agent.activity_col:
             summary["unique_activities"] = df[agent.activity_col].nunique()
-            summary["most_common_activity"] = df[agent.activity_col].value_counts().index[0]
-            summary["activity_counts"] = df[agent.activity_col].value_counts().head(5).to_dict()
+            summary["most_common_activity"] = agent.column_counts(agent.activity_col).index[0]
+            summary["activity_counts"] = agent.column_counts(agent.activity_col).head(5).to_dict()
             
         if hasattr(agent, 'team_col') and agent.team_col:
             summary["unique_teams"] = df[agent.team_col].nunique()
-            summary["team_counts"] = df[agent.team_col].value_counts().to_dict()
-            
-        return summary
+            summary["team_counts"] = agent.column_counts(agent.team_col).to_dict()
+        
+        agent.summary_cache[cache_key] = summary
+        return copy.deepcopy(summary)
     
     def identify_completed_tasks(self, df, activity_col):
         """Identify completed/closed tasks that should be excluded from bottleneck analysis"""
@@ -210,8 +248,43 @@ class CreativeDataChatBot:
         
         return completed_tasks
     
-    def chat_with_ai(self, question: str) -> str:
-        """Chat with AI about the data using higher temperature for creative responses"""
+    def _chat_messages(self, question: str, data_summary: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Chat messages for a question: analyst context built from the dataset summary, then the question"""
+        context = f"""
+        You are a creative and insightful task mining analyst assistant. You have access to {self.current_dataset} dataset with the following information:
+        
+        Dataset: {data_summary['dataset']}
+        Rows: {data_summary['rows']}
+        Columns: {', '.join(data_summary['columns'][:10])}
+        
+        Key Insights:
+        - Unique Users: {data_summary.get('unique_users', 'N/A')}
+        - Most Active User: {data_summary.get('most_active_user', 'N/A')}
+        - Average Duration: {data_summary.get('avg_duration', 'N/A')}
+        - Unique Activities: {data_summary.get('unique_activities', 'N/A')}
+        - Most Common Activity: {data_summary.get('most_common_activity', 'N/A')}
+        
+        User Activity Breakdown: {data_summary.get('user_activity_counts', {})}
+        Activity Breakdown: {data_summary.get('activity_counts', {})}
+        
+        IMPORTANT: When analyzing bottlenecks, consider that completed/closed tasks are NOT bottlenecks - they are successful process completions. 
+        Focus on active, ongoing, or problematic activities that cause delays in the workflow.
+        
+        Please provide creative, insightful, and actionable responses. Be conversational and engaging while remaining professional.
+        Offer multiple perspectives and suggest innovative solutions. If you need more detailed analysis, suggest running specific commands like 'summary', 'bottlenecks', etc.
+        """
+        
+        return [
+            {"role": "system", "content": context},
+            {"role": "user", "content": question}
+        ]
+    
+    def chat_with_ai(self, question: str, on_delta=None) -> str:
+        """Chat with AI about the data using higher temperature for creative responses
+        
+        If on_delta is given, the completion is streamed and each text chunk is
+        passed to it as it arrives; the full response is still returned.
+        """
         if not OPENAI_AVAILABLE:
             return "AI chat not available. Please install OpenAI: pip install openai"
         
@@ -219,51 +292,73 @@ class CreativeDataChatBot:
             # Get current dataset summary
             data_summary = self.get_data_summary(self.current_dataset)
             
-            # Create enhanced context for AI
-            context = f"""
-            You are a creative and insightful task mining analyst assistant. You have access to {self.current_dataset} dataset with the following information:
-            
-            Dataset: {data_summary['dataset']}
-            Rows: {data_summary['rows']}
-            Columns: {', '.join(data_summary['columns'][:10])}
-            
-            Key Insights:
-            - Unique Users: {data_summary.get('unique_users', 'N/A')}
-            - Most Active User: {data_summary.get('most_active_user', 'N/A')}
-            - Average Duration: {data_summary.get('avg_duration', 'N/A')}
-            - Unique Activities: {data_summary.get('unique_activities', 'N/A')}
-            - Most Common Activity: {data_summary.get('most_common_activity', 'N/A')}
-            
-            User Activity Breakdown: {data_summary.get('user_activity_counts', {})}
-            Activity Breakdown: {data_summary.get('activity_counts', {})}
-            
-            IMPORTANT: When analyzing bottlenecks, consider that completed/closed tasks are NOT bottlenecks - they are successful process completions. 
-            Focus on active, ongoing, or problematic activities that cause delays in the workflow.
-            
-            Please provide creative, insightful, and actionable responses. Be conversational and engaging while remaining professional.
-            Offer multiple perspectives and suggest innovative solutions. If you need more detailed analysis, suggest running specific commands like 'summary', 'bottlenecks', etc.
-            """
-            
             # Use new OpenAI API with higher temperature for creative responses
             response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": context},
-                    {"role": "user", "content": question}
-                ],
-                max_tokens=600,  # Increased for more detailed responses
-                temperature=0.8,  # Higher temperature for more creative responses
-                top_p=0.9,  # Higher top_p for more diverse responses
-                presence_penalty=0.1,  # Slight penalty to avoid repetition
-                frequency_penalty=0.1   # Slight penalty to encourage variety
+                messages=self._chat_messages(question, data_summary),
+                stream=on_delta is not None,
+                **CHAT_COMPLETION_PARAMS
             )
             
-            return response.choices[0].message.content
+            if on_delta is None:
+                return response.choices[0].message.content
+            
+            parts = []
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    on_delta(delta)
+                    parts.append(delta)
+            return "".join(parts)
             
         except Exception as e:
             return f"AI chat error: {e}"
     
-    def handle_smart_query(self, query: str) -> str:
+    async def _achat(self, aclient, semaphore, messages: List[Dict[str, str]]) -> str:
+        """One completion on the async client, at most OPENAI_MAX_CONCURRENT at a time"""
+        async with semaphore:
+            try:
+                response = await aclient.chat.completions.create(messages=messages, **CHAT_COMPLETION_PARAMS)
+                return response.choices[0].message.content
+            except Exception as e:
+                return f"AI chat error: {e}"
+    
+    async def chat_many(self, questions: List[str]) -> List[str]:
+        """Answer several questions with concurrent requests (answers in question order)"""
+        data_summary = self.get_data_summary(self.current_dataset)
+        semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENT)
+        aclient = AsyncOpenAI(api_key=os.getenv('SECRET_KEY'), max_retries=OPENAI_MAX_RETRIES)
+        try:
+            return await asyncio.gather(*(
+                self._achat(aclient, semaphore, self._chat_messages(q, data_summary))
+                for q in questions
+            ))
+        finally:
+            await aclient.close()
+    
+    def chat_with_ai_many(self, questions: List[str]) -> List[str]:
+        """
+        Chat with AI about several questions at once (batch/eval workloads)
+        
+        The requests overlap instead of waiting for each other; failed
+        requests yield an error string in their slot, like chat_with_ai.
+        
+        Args:
+            questions: Questions about the current dataset
+        
+        Returns:
+            One answer per question, in the same order
+        """
+        if not OPENAI_AVAILABLE:
+            return ["AI chat not available. Please install OpenAI: pip install openai"] * len(questions)
+        
+        try:
+            return asyncio.run(self.chat_many(questions))
+        except Exception as e:
+            return [f"AI chat error: {e}"] * len(questions)
+    
+    def handle_smart_query(self, query: str, on_delta=None) -> str:
         """Handle smart queries with automatic detection"""
         query_lower = query.lower()
         
@@ -292,33 +387,33 @@ class CreativeDataChatBot:
         
         # Handle specific question patterns
         if any(word in query_lower for word in ["who", "most active", "busiest", "active user", "prevalent"]):
-            return self.answer_user_questions(query, agent, df)
+            return self.answer_user_questions(query, agent, df, on_delta)
         
         if any(word in query_lower for word in ["how many", "count", "total", "number", "many users"]):
-            return self.answer_count_questions(query, agent, df)
+            return self.answer_count_questions(query, agent, df, on_delta)
         
         if any(word in query_lower for word in ["average", "mean", "duration", "time", "longest", "shortest"]):
-            return self.answer_duration_questions(query, agent, df)
+            return self.answer_duration_questions(query, agent, df, on_delta)
         
         if any(word in query_lower for word in ["activity", "activities", "common", "frequent"]):
-            return self.answer_activity_questions(query, agent, df)
+            return self.answer_activity_questions(query, agent, df, on_delta)
         
         if any(word in query_lower for word in ["team", "teams", "group"]):
-            return self.answer_team_questions(query, agent, df)
+            return self.answer_team_questions(query, agent, df, on_delta)
         
         if any(word in query_lower for word in ["bottleneck", "bottlenecks", "some", "types"]):
             return self.answer_bottleneck_questions(query, agent, df)
         
         # Default to AI chat for creative responses
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
-    def answer_user_questions(self, query: str, agent, df) -> str:
+    def answer_user_questions(self, query: str, agent, df, on_delta=None) -> str:
         """Answer questions about users"""
         if not hasattr(agent, 'user_col') or not agent.user_col:
             return "User information not available in this dataset."
         
         user_col = agent.user_col
-        user_counts = df[user_col].value_counts()
+        user_counts = agent.column_counts(user_col)
         
         if "most active" in query.lower() or "busiest" in query.lower() or "prevalent" in query.lower():
             most_active = user_counts.index[0]
@@ -335,9 +430,9 @@ class CreativeDataChatBot:
         if "who" in query.lower():
             return f"👤 The most active user is '{user_counts.index[0]}' with {user_counts.iloc[0]} activities."
         
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
-    def answer_count_questions(self, query: str, agent, df) -> str:
+    def answer_count_questions(self, query: str, agent, df, on_delta=None) -> str:
         """Answer questions about counts and totals"""
         if "how many users" in query.lower() or "number of users" in query.lower():
             if hasattr(agent, 'user_col') and agent.user_col:
@@ -359,9 +454,9 @@ class CreativeDataChatBot:
                 count = df[agent.user_col].nunique()
                 return f"👥 There are {count} unique users in the {self.current_dataset} dataset."
         
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
-    def answer_duration_questions(self, query: str, agent, df) -> str:
+    def answer_duration_questions(self, query: str, agent, df, on_delta=None) -> str:
         """Answer questions about duration and timing"""
         if not hasattr(agent, 'duration_col') or not agent.duration_col:
             return "Duration information not available in this dataset."
@@ -386,15 +481,15 @@ class CreativeDataChatBot:
             min_duration = df[duration_col].min()
             return f"⏱️ Duration stats: Average={avg_duration:.2f}s, Max={max_duration:.2f}s, Min={min_duration:.2f}s. Quite a range of process speeds!"
         
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
-    def answer_activity_questions(self, query: str, agent, df) -> str:
+    def answer_activity_questions(self, query: str, agent, df, on_delta=None) -> str:
         """Answer questions about activities"""
         if not hasattr(agent, 'activity_col') or not agent.activity_col:
             return "Activity information not available in this dataset."
         
         activity_col = agent.activity_col
-        activity_counts = df[activity_col].value_counts()
+        activity_counts = agent.column_counts(activity_col)
         
         if "most common" in query.lower() or "frequent" in query.lower():
             most_common = activity_counts.index[0]
@@ -413,15 +508,15 @@ class CreativeDataChatBot:
             count = activity_counts.iloc[0]
             return f"🔥 The most common activity is '{most_common}' with {count} occurrences."
         
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
-    def answer_team_questions(self, query: str, agent, df) -> str:
+    def answer_team_questions(self, query: str, agent, df, on_delta=None) -> str:
         """Answer questions about teams"""
         if not hasattr(agent, 'team_col') or not agent.team_col:
             return "Team information not available in this dataset."
         
         team_col = agent.team_col
-        team_counts = df[team_col].value_counts()
+        team_counts = agent.column_counts(team_col)
         
         if "how many teams" in query.lower():
             count = df[team_col].nunique()
@@ -436,7 +531,7 @@ class CreativeDataChatBot:
             count = df[team_col].nunique()
             return f"👥 There are {count} unique teams in the {self.current_dataset} dataset."
         
-        return self.chat_with_ai(query)
+        return self.chat_with_ai(query, on_delta)
     
     def answer_bottleneck_questions(self, query: str, agent, df) -> str:
         """Answer questions about bottlenecks with completed task filtering"""
@@ -454,7 +549,7 @@ class CreativeDataChatBot:
             return "All activities appear to be completed tasks. No active bottlenecks found!"
         
         # Calculate bottlenecks for active tasks only
-        activity_duration = active_df.groupby(agent.activity_col)[agent.duration_col].mean().sort_values(ascending=False)
+        activity_duration = active_df.groupby(agent.activity_col, observed=True)[agent.duration_col].mean().sort_values(ascending=False)
         top_bottlenecks = activity_duration.head(5)
         
         result = f"🚧 Top 5 bottlenecks in {self.current_dataset} dataset (excluding completed tasks):\n"
@@ -472,9 +567,30 @@ class CreativeDataChatBot:
 # Enhanced Agent Classes (from original with completed task awareness)
 # -------------------------------
 class Agent:
+    # Attribute name -> find_column candidates for each column the agent reads
+    COLUMN_CANDIDATES: Dict[str, List[str]] = {}
+
     def __init__(self, name: str, df: pd.DataFrame):
         self.name = name
         self.df = df
+        for attr, candidates in self.COLUMN_CANDIDATES.items():
+            setattr(self, attr, find_column(df, candidates))
+        self._value_counts: Dict[str, pd.Series] = {}
+        # CreativeDataChatBot.get_data_summary results keyed by (dataset, id(df), rows)
+        self.summary_cache: Dict[tuple, Dict[str, Any]] = {}
+
+    def column_counts(self, col: str) -> pd.Series:
+        """df[col].value_counts(), computed once per column (treat the result as read-only)"""
+        counts = self._value_counts.get(col)
+        if counts is None:
+            counts = self._value_counts[col] = self.df[col].value_counts()
+        return counts
+
+    @classmethod
+    def required_columns(cls, df: pd.DataFrame) -> List[str]:
+        """Columns of df (only its header is used) that this agent would read"""
+        resolved = (find_column(df, candidates) for candidates in cls.COLUMN_CANDIDATES.values())
+        return list(dict.fromkeys(c for c in resolved if c))
 
     def help(self) -> str:
         return (
@@ -496,16 +612,19 @@ class Agent:
         raise NotImplementedError
 
 class SalesforceAgent(Agent):
+    COLUMN_CANDIDATES = {
+        "user_col": ["user", "resource", "agent_profile_id"],
+        "team_col": ["team", "teams"],
+        "duration_col": ["duration_seconds", "duration", "task_duration", "elapsed"],
+        "activity_col": ["activity", "step", "original_activity"],
+        "app_col": ["process_name", "process", "application", "window", "process_name"],
+        "case_col": ["case_id", "case", "id"],
+        "start_col": ["start_time", "start", "timestamp"],
+        "end_col": ["end_time", "end"],
+    }
+
     def __init__(self, df: pd.DataFrame):
         super().__init__("SalesforceAgent", df)
-        self.user_col = find_column(df, ["user", "resource", "agent_profile_id"])
-        self.team_col = find_column(df, ["team", "teams"])
-        self.duration_col = find_column(df, ["duration_seconds", "duration", "task_duration", "elapsed"])
-        self.activity_col = find_column(df, ["activity", "step", "original_activity"])
-        self.app_col = find_column(df, ["process_name", "process", "application", "window", "process_name"])
-        self.case_col = find_column(df, ["case_id", "case", "id"])
-        self.start_col = find_column(df, ["start_time", "start", "timestamp"])
-        self.end_col = find_column(df, ["end_time", "end"])
         
         if self.duration_col and not pd.api.types.is_numeric_dtype(self.df[self.duration_col]):
             self.df[self.duration_col] = pd.to_numeric(self.df[self.duration_col], errors="coerce")
@@ -545,7 +664,7 @@ class SalesforceAgent(Agent):
         
         if self.user_col and self.duration_col:
             agg = (
-                self.df.groupby(self.user_col)[self.duration_col]
+                self.df.groupby(self.user_col, observed=True)[self.duration_col]
                 .mean()
                 .reset_index()
                 .sort_values(self.duration_col, ascending=False)
@@ -576,7 +695,7 @@ class SalesforceAgent(Agent):
             return {"text": "All activities appear to be completed tasks. No active bottlenecks found!"}
         
         agg = (
-            active_df.groupby(self.activity_col)[self.duration_col]
+            active_df.groupby(self.activity_col, observed=True)[self.duration_col]
             .mean()
             .reset_index()
             .sort_values(self.duration_col, ascending=False)
@@ -636,7 +755,7 @@ class SalesforceAgent(Agent):
         if not (self.team_col and self.duration_col):
             return {"text": "Team view unavailable (team or duration column missing)."}
         agg = (
-            self.df.groupby(self.team_col)[self.duration_col]
+            self.df.groupby(self.team_col, observed=True)[self.duration_col]
             .mean()
             .reset_index()
             .sort_values(self.duration_col, ascending=False)
@@ -665,7 +784,7 @@ class SalesforceAgent(Agent):
     def app_usage(self) -> Dict[str, Any]:
         if not self.app_col:
             return {"text": "Could not find application/process column to compute app usage."}
-        counts = self.df[self.app_col].value_counts().reset_index()
+        counts = self.column_counts(self.app_col).reset_index()
         counts.columns = ["application", "events"]
         chart = (
             alt.Chart(counts.head(20))
@@ -736,14 +855,17 @@ class SalesforceAgent(Agent):
         return {"text": fallback_text}
 
 class AmadeusAgent(Agent):
+    COLUMN_CANDIDATES = {
+        "activity_col": ["activity", "step"],
+        "user_col": ["resource", "user", "agent"],
+        "team_col": ["team"],
+        "duration_col": ["duration", "duration_seconds"],
+        "title_col": ["title", "window_title"],
+        "process_col": ["process_name", "application", "process"],
+    }
+
     def __init__(self, df: pd.DataFrame):
         super().__init__("AmadeusAgent", df)
-        self.activity_col = find_column(df, ["activity", "step"])
-        self.user_col = find_column(df, ["resource", "user", "agent"])
-        self.team_col = find_column(df, ["team"])
-        self.duration_col = find_column(df, ["duration", "duration_seconds"])
-        self.title_col = find_column(df, ["title", "window_title"])
-        self.process_col = find_column(df, ["process_name", "application", "process"])
         if self.duration_col and not pd.api.types.is_numeric_dtype(self.df[self.duration_col]):
             self.df[self.duration_col] = pd.to_numeric(self.df[self.duration_col], errors="coerce")
         
@@ -763,7 +885,7 @@ class AmadeusAgent(Agent):
         n_acts = self.df[self.activity_col].nunique() if self.activity_col else None
         text = f"Amadeus dataset summary: rows={n_rows}, users={n_users}, unique activities={n_acts}"
         if self.activity_col:
-            vc = self.df[self.activity_col].value_counts().reset_index()
+            vc = self.column_counts(self.activity_col).reset_index()
             vc.columns = ["activity", "events"]
             chart = (
                 alt.Chart(vc.head(20))
@@ -791,7 +913,7 @@ class AmadeusAgent(Agent):
             return {"text": "All activities appear to be completed tasks. No active bottlenecks found!"}
         
         agg = (
-            active_df.groupby(self.activity_col)[self.duration_col]
+            active_df.groupby(self.activity_col, observed=True)[self.duration_col]
             .mean()
             .reset_index()
             .sort_values(self.duration_col, ascending=False)
@@ -910,7 +1032,8 @@ class CreativeOrchestrator:
         
         return None
 
-    def route(self, q: str) -> Dict[str, Any]:
+    def route(self, q: str, on_delta=None) -> Dict[str, Any]:
+        # on_delta receives streamed AI chat text as it arrives (see CreativeDataChatBot.chat_with_ai)
         if q.strip().lower() == "switch":
             self.active = "amadeus" if self.active == "salesforce" else "salesforce"
             self.chatbot.current_dataset = self.active
@@ -928,7 +1051,7 @@ class CreativeOrchestrator:
         
         # Check if it's a chat query
         if self.chatbot.is_chat_query(q):
-            response = self.chatbot.handle_smart_query(q)
+            response = self.chatbot.handle_smart_query(q, on_delta)
             return {"text": f"🤖 {response}"}
         
         # Regular agent handling
@@ -0,0 +1,121 @@
+"""
+Unit tests for the direct-answer intents and response cache of the chat interface
+"""
+
+import importlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import types
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+@pytest.fixture(scope="module")
+def chat(tmp_path_factory):
+    """chat_with_data imported against a stub task_mining_multi_agent module"""
+    stub = types.ModuleType("task_mining_multi_agent")
+    stub.SalesforceAgent = stub.AmadeusAgent = object
+    stub.load_csv = stub.find_column = stub.save_chart = lambda *args, **kwargs: None
+    stub.BASE_DIR = str(tmp_path_factory.mktemp("chat_data"))
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, "task_mining_multi_agent", stub)
+        mp.delitem(sys.modules, "chat_with_data", raising=False)
+        module = importlib.import_module("chat_with_data")
+        yield module
+        mp.delitem(sys.modules, "chat_with_data", raising=False)
+
+
+STATS = {
+    "salesforce": {
+        "most_active_user": "alice",
+        "most_active_count": 42,
+        "unique_users": 100,
+        "unique_activities": 12,
+        "avg_duration": 30.5
+    }
+}
+
+
+def _bot(chat):
+    bot = chat.DataChatBot.__new__(chat.DataChatBot)
+    bot._stats_cache = STATS
+    return bot
+
+
+@pytest.mark.parametrize("question", [
+    "How many users are there?",
+    "how many unique users do we have",
+    "What is the number of users?",
+    "number of distinct users",
+    "Unique users?"
+])
+def test_user_count_questions_answered_directly(chat, question):
+    """Test count questions about users are answered from the stats"""
+    assert _bot(chat).answer_direct(question) == "salesforce: 100 unique users"
+
+
+@pytest.mark.parametrize("question", [
+    "How many activities are there?",
+    "What's the number of unique activities?",
+    "distinct activities"
+])
+def test_activity_count_questions_answered_directly(chat, question):
+    """Test count questions about activities are answered from the stats"""
+    assert _bot(chat).answer_direct(question) == "salesforce: 12 unique activities"
+
+
+@pytest.mark.parametrize("question", [
+    "Who are the users?",
+    "What are the activities?",
+    "users",
+    "activities",
+    "How many users are there and why?"
+])
+def test_non_count_questions_go_to_model(chat, question):
+    """Test questions without a count cue are not answered with a count"""
+    assert _bot(chat).answer_direct(question) is None
+
+
+def test_other_intents_still_match(chat):
+    """Test the most-active-user and average-duration intents"""
+    bot = _bot(chat)
+    assert bot.answer_direct("Who is the most active user?") == "salesforce: alice (42 events)"
+    assert bot.answer_direct("average duration") == "salesforce: 30.50 seconds"
+
+
+def _cache_bot(chat):
+    bot = chat.DataChatBot.__new__(chat.DataChatBot)
+    bot._cache_lock = threading.RLock()
+    bot._response_cache = OrderedDict()
+    return bot
+
+
+def test_semantic_cache_keeps_opposite_questions_apart(chat):
+    """Test a close embedding is not reused when the key terms differ"""
+    bot = _cache_bot(chat)
+    embedding = np.array([1.0, 0.0], dtype=np.float32)
+    fastest = "Which user is fastest?"
+    bot._cache_response("k1", embedding, chat.question_key_terms(fastest), "alice")
+    
+    # Near-identical embeddings, as the model gives for these questions
+    close = np.array([0.99, 0.14], dtype=np.float32)
+    close /= np.linalg.norm(close)
+    slowest = chat.question_key_terms("Which user is slowest?")
+    assert bot._find_similar_response(close, slowest) is None
+    assert bot._find_similar_response(close, chat.question_key_terms("Who is the fastest user?")) == "alice"
+
+
+def test_dataset_fingerprint_tracks_source_file(chat):
+    """Test the fingerprint changes when the file changes but its shape does not"""
+    bot = chat.DataChatBot.__new__(chat.DataChatBot)
+    bot._info_cache = {"salesforce": {"rows": 10, "columns": ["user", "duration"]}}
+    bot._source_signatures = {"salesforce": (1000, 1)}
+    before = bot._dataset_fingerprint()
+    bot._source_signatures["salesforce"] = (1000, 2)
+    assert bot._dataset_fingerprint() != before
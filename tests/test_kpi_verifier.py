@@ -42,6 +42,14 @@ def test_extract_numeric_claims_multiple_patterns():
     assert len(flow_claims) > 0
 
 
+def test_extract_numeric_claims_long_snake_case_run():
+    """Test long underscore-separated words without a value do not stall extraction"""
+    text = "a_" * 40 + "! flow_efficiency = 0.5"
+    claims = extract_numeric_claims(text)
+    
+    assert [c["name"] for c in claims] == ["flow_efficiency"]
+
+
 def test_extract_numeric_claims_facts_block():
     """Test extraction from JSON facts block"""
     text = """
@@ -0,0 +1,149 @@
+"""
+Unit tests for pandas metric computation functions
+
+The vectorized metrics are checked against straightforward per-case
+reference implementations (the original loop-based versions).
+"""
+
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import metrics
+from backend.metrics import (
+    flow_efficiency, case_aging_buckets, throughput_minutes, handoffs,
+    compute_panel_metrics, filter_dataframe
+)
+
+
+def _sample_df():
+    """Small event log with missing case IDs, a missing duration and cases aged exactly 7 and 14 days"""
+    return pd.DataFrame({
+        "case_id": ["C1", "C1", "C1", "C2", None, "C2", "C3", "C4", None, "C5", "C4"],
+        "user": ["ann", "bob", "ann", "bob", "eve", "bob", "ann", "eve", "bob", "ann", "ann"],
+        "team": ["Ops", "Ops", "Sales", "Sales", "Ops", "Sales", "Ops", "Ops", "Sales", "Ops", "Sales"],
+        "activity": ["Open", "Review", "Close", "Open", "Open", "Close", "Open", "Open", "Review", "Review", "Close"],
+        "start_time": ["2025-01-01 00:00", "2025-01-02 00:00", "2025-01-03 00:00",
+                       "2025-01-08 00:00", "2024-12-01 00:00", "2025-01-09 00:00",
+                       "2024-12-30 00:00", "2025-01-10 00:00", "2025-01-11 00:00",
+                       "2025-01-15 00:00", "2025-01-12 00:00"],
+        "end_time": ["2025-01-01 02:00", "2025-01-02 01:00", "2025-01-03 03:00",
+                     "2025-01-08 01:00", "2024-12-01 01:00", "2025-01-09 02:00",
+                     "2024-12-30 05:00", "2025-01-10 01:00", "2025-01-11 01:00",
+                     "2025-01-15 01:00", "2025-01-12 02:00"],
+        "duration_seconds": [3600.0, 1800.0, 7200.0, 900.0, 600.0, np.nan, 5400.0, 1200.0, 300.0, 2400.0, 3000.0],
+    })
+
+
+def _baseline_flow_efficiency(df):
+    total_work_time = df.groupby("case_id")["duration_seconds"].sum().sum()
+    lead_times = []
+    for case_id in df["case_id"].unique():
+        case_data = df[df["case_id"] == case_id]
+        starts = pd.to_datetime(case_data["start_time"], errors="coerce")
+        ends = pd.to_datetime(case_data["end_time"], errors="coerce")
+        if not starts.isna().all() and not ends.isna().all():
+            lead_times.append((ends.max() - starts.min()).total_seconds())
+    return min(1.0, total_work_time / sum(lead_times))
+
+
+def _baseline_aging_buckets(df):
+    case_starts = pd.to_datetime(df.groupby("case_id")["start_time"].min())
+    now = pd.to_datetime(df["start_time"]).max()
+    ages = (now - case_starts).dt.total_seconds() / 86400
+    return {
+        "0-7d": (ages <= 7).sum(),
+        "8-14d": ((ages > 7) & (ages <= 14)).sum(),
+        ">14d": (ages > 14).sum()
+    }
+
+
+def _baseline_handoffs(df):
+    sorted_df = df.sort_values(["case_id", "start_time"])
+    counts = []
+    for case_id in sorted_df["case_id"].unique():
+        users = sorted_df[sorted_df["case_id"] == case_id]["user"].tolist()
+        counts.append(sum(users[i] != users[i - 1] for i in range(1, len(users))))
+    return np.mean(counts)
+
+
+def test_flow_efficiency_matches_baseline():
+    """Test flow efficiency against per-case lead times, missing case IDs dropped"""
+    df = _sample_df()
+    assert flow_efficiency(df) == pytest.approx(_baseline_flow_efficiency(df))
+
+
+def test_case_aging_buckets_boundaries():
+    """Test cases exactly 7 and 14 days old fall in the lower bucket"""
+    df = _sample_df()
+    buckets = case_aging_buckets(df)
+    
+    # C2 starts exactly 7 days and C1 exactly 14 days before the last activity
+    assert buckets == {"0-7d": 3, "8-14d": 1, ">14d": 1}
+    assert buckets == _baseline_aging_buckets(df)
+
+
+def test_throughput_minutes_matches_baseline():
+    """Test throughput equals the mean of per-case duration totals"""
+    df = _sample_df()
+    expected = df.groupby("case_id")["duration_seconds"].sum().mean() / 60.0
+    assert throughput_minutes(df) == pytest.approx(expected)
+
+
+def test_handoffs_matches_baseline():
+    """Test adjacent-row handoff counting, with missing case IDs counted as a case without handoffs"""
+    df = _sample_df()
+    assert handoffs(df) == pytest.approx(_baseline_handoffs(df))
+
+
+def test_panel_metrics_match_individual_metrics():
+    """Test the shared-groupby panel agrees with the standalone metric functions"""
+    df = _sample_df()
+    panel = compute_panel_metrics(df)
+    
+    assert panel["flow_efficiency"] == pytest.approx(flow_efficiency(df))
+    assert panel["throughput_minutes"] == pytest.approx(throughput_minutes(df))
+    assert panel["handoffs"] == pytest.approx(handoffs(df))
+    assert panel["aging_buckets"] == case_aging_buckets(df)
+    assert panel["unique_activities"] == df["activity"].nunique()
+    assert panel["most_common_activity"] == df["activity"].value_counts().index[0]
+    assert panel["unique_users"] == df["user"].nunique()
+
+
+@pytest.mark.skipif(not metrics.POLARS_AVAILABLE, reason="polars not installed")
+def test_polars_case_sums_match_pandas(monkeypatch):
+    """Test the polars per-case sums give the same panel as the pandas groupby"""
+    df = _sample_df()
+    pandas_panel = compute_panel_metrics(df)
+    
+    monkeypatch.setattr(metrics, "POLARS_MIN_ROWS", 0)
+    case_sums = metrics._case_sums_polars(df["case_id"], df["duration_seconds"])
+    assert case_sums is not None
+    assert np.sort(case_sums).tolist() == pytest.approx(
+        np.sort(df.groupby("case_id")["duration_seconds"].sum().to_numpy()).tolist())
+    
+    polars_panel = compute_panel_metrics(df)
+    assert polars_panel["flow_efficiency"] == pytest.approx(pandas_panel["flow_efficiency"])
+    assert polars_panel["throughput_minutes"] == pytest.approx(pandas_panel["throughput_minutes"])
+
+
+def test_filter_dataframe_combined_mask():
+    """Test combined filters select the same rows as applying them one by one"""
+    df = _sample_df()
+    filters = {
+        "team": ["Ops"],
+        "resource": "ann",
+        "time_range": {"start": "2024-12-31", "end": "2025-01-14"}
+    }
+    
+    timestamps = pd.to_datetime(df["start_time"])
+    expected = df[(df["team"] == "Ops") & (df["user"] == "ann")
+                  & (timestamps >= "2024-12-31") & (timestamps <= "2025-01-14")]
+    
+    pd.testing.assert_frame_equal(filter_dataframe(df, filters), expected)
+    assert filter_dataframe(df, {"case_id": "C1"})["case_id"].tolist() == ["C1", "C1", "C1"]
@@ -4,19 +4,20 @@ Unit tests for KPI rollup module
 
 import pytest
 import json
+import os
 import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, date
 import sys
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.kpi_rollup import (
-    read_traces, compute_grounded_accuracy_rate, compute_routing_accuracy,
+    read_traces, iter_traces, compute_grounded_accuracy_rate, compute_routing_accuracy,
     compute_metric_parity_mape, compute_hallucination_rate, compute_contradiction_rate,
     compute_latency_percentiles, compute_adoption_metrics, compute_resolution_metrics,
-    rollup
+    rollup, rollup_date_range, load_cached_rollup, _accumulate
 )
 
 
@@ -110,6 +111,27 @@ def test_read_traces_valid_file():
         assert traces[0]["endpoint"] == "/api/analyze/salesforce"
 
 
+def test_iter_traces_streams_and_skips_malformed():
+    """Test streaming trace reader yields records and skips bad lines"""
+    sample_traces = create_sample_traces()
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trace_file = Path(tmpdir) / "traces-20251001.jsonl"
+        
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(sample_traces[0]) + '\n')
+            f.write('{not valid json\n')
+            f.write('\n')
+            f.write(json.dumps(sample_traces[1]) + '\n')
+        
+        stream = iter_traces(trace_file)
+        assert not isinstance(stream, list)
+        
+        traces = list(stream)
+        assert len(traces) == 2
+        assert traces[1]["endpoint"] == sample_traces[1]["endpoint"]
+
+
 def test_compute_grounded_accuracy_rate():
     """Test grounded accuracy rate calculation"""
     traces = create_sample_traces()
@@ -232,6 +254,34 @@ def test_compute_resolution_metrics():
     assert resolution["sessions_resolved_rate"] == 0.5
 
 
+def test_single_kpi_functions_match_fused_pass():
+    """Test each single-KPI pass agrees with the fused accumulator"""
+    traces = create_sample_traces() + [
+        {
+            "endpoint": "/api/analyze",
+            "latency_ms_total": 90.0,
+            "extracted_metrics": {
+                "has_numeric_claims": True,
+                "all_claims": [{"name": "handoffs", "value": 3}],
+                "hallucination_check": {"has_hallucinations": True}
+            },
+            "resolved": True
+        },
+        {"endpoint": "/api/agent", "session_id": None, "latency_ms_model": 40.0}
+    ]
+    acc = _accumulate(traces)
+    
+    assert compute_grounded_accuracy_rate(traces) == acc.grounded_accuracy_rate()
+    assert compute_routing_accuracy(traces) == acc.routing_accuracy()
+    assert compute_metric_parity_mape(traces) == acc.metric_parity_mape()
+    assert compute_hallucination_rate(traces) == acc.hallucination_rate()
+    assert compute_contradiction_rate(traces) == acc.contradiction_rate()
+    assert compute_latency_percentiles(traces) == acc.latency_percentiles()
+    assert compute_latency_percentiles(traces, "/api/agent") == acc.latency_percentiles("/api/agent")
+    assert compute_adoption_metrics(traces) == acc.adoption_metrics()
+    assert compute_resolution_metrics(traces) == acc.resolution_metrics()
+
+
 def test_rollup_full():
     """Test full rollup computation"""
     sample_traces = create_sample_traces()
@@ -275,6 +325,52 @@ def test_rollup_empty_file():
         assert "error" in kpis
 
 
+def test_rollup_date_range_parallel_keeps_date_order():
+    """Test multi-day rollup returns one rollup per existing day, in order"""
+    sample_traces = create_sample_traces()
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for day in ["20251001", "20251003"]:
+            with open(Path(tmpdir) / f"traces-{day}.jsonl", 'w', encoding='utf-8') as f:
+                for trace in sample_traces:
+                    f.write(json.dumps(trace) + '\n')
+        
+        rollups = rollup_date_range(Path(tmpdir), date(2025, 10, 1), date(2025, 10, 3), max_workers=2)
+        
+        assert [kpis["date"] for kpis in rollups] == ["20251001", "20251003"]
+        assert all(kpis["trace_count"] == 3 for kpis in rollups)
+
+
+def test_rollup_date_range_reuses_cached_days():
+    """Test saved daily rollups are reused until their trace file changes"""
+    sample_traces = create_sample_traces()
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        trace_file = Path(tmpdir) / "traces-20251001.jsonl"
+        cache_dir = Path(tmpdir) / "kpis"
+        
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            for trace in sample_traces:
+                f.write(json.dumps(trace) + '\n')
+        
+        first = rollup_date_range(Path(tmpdir), date(2025, 10, 1), date(2025, 10, 1), cache_dir=cache_dir)
+        assert load_cached_rollup(trace_file, cache_dir)["trace_count"] == 3
+        
+        # Fresh cache is served without re-reading the trace file
+        cache_file = cache_dir / "kpis-20251001.json"
+        cached = json.loads(cache_file.read_text(encoding='utf-8'))
+        cached["trace_count"] = 99
+        cache_file.write_text(json.dumps(cached), encoding='utf-8')
+        second = rollup_date_range(Path(tmpdir), date(2025, 10, 1), date(2025, 10, 1), cache_dir=cache_dir)
+        assert second[0]["trace_count"] == 99
+        
+        # A newer trace file invalidates the cache
+        stat = cache_file.stat()
+        os.utime(trace_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        third = rollup_date_range(Path(tmpdir), date(2025, 10, 1), date(2025, 10, 1), cache_dir=cache_dir)
+        assert third[0]["trace_count"] == first[0]["trace_count"] == 3
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
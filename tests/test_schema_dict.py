@@ -0,0 +1,65 @@
+"""
+Unit tests for schema dictionary module
+"""
+
+import pytest
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import schema_dict
+from backend.schema_dict import build_schema_dict, cached_validate_references
+
+
+def _sample_df():
+    return pd.DataFrame({
+        "case_id": [1, 1, 2],
+        "team": ["Sales-Ops", "Sales-Ops", "Support"],
+        "activity": ["Start", "Review", "Start"]
+    })
+
+
+def test_cached_validate_references_validates_text():
+    """Test cached validation checks the actual text and matches the uncached result"""
+    sd = build_schema_dict(_sample_df(), None)
+    text = 'The team "Ghost Team" handled made_up_column'
+    
+    result = cached_validate_references(text, "salesforce")
+    
+    assert result == sd.validate_references(text, "salesforce")
+    values = {e["value"] for e in result["unknown_entities"]}
+    assert "Ghost Team" in values
+    assert "made_up_column" in values
+    
+    # Hits return an equal copy, so callers cannot alter the cached entry
+    result["has_hallucinations"] = None
+    result["unknown_entities"].clear()
+    cached = cached_validate_references(text, "salesforce")
+    assert cached is not result
+    assert cached == sd.validate_references(text, "salesforce")
+
+
+def test_cached_validate_references_expires_on_rebuild():
+    """Test cached results are dropped when the schema is rebuilt"""
+    build_schema_dict(_sample_df(), None)
+    text = 'The team "Finance" is busy'
+    assert cached_validate_references(text, "salesforce")["has_hallucinations"] is True
+    
+    df = _sample_df()
+    df.loc[2, "team"] = "Finance"
+    build_schema_dict(df, None)
+    assert cached_validate_references(text, "salesforce")["has_hallucinations"] is False
+
+
+def test_cached_validate_references_uninitialized(monkeypatch):
+    """Test cached validation without a schema dictionary"""
+    monkeypatch.setattr(schema_dict, "_global_schema_dict", None)
+    result = cached_validate_references("anything", "salesforce")
+    assert result["checked"] is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])